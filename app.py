@@ -14,11 +14,16 @@ https://github.com/sdercolin/utaformatix3
 """
 
 from flask import Flask, request, jsonify, send_file, Response
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+import orjson
 import os
-import tempfile
 import io
 import json
+import hashlib
+import threading
+from collections import OrderedDict
+from operator import itemgetter
 from midi_parser import parse_midi
 from lyrics_parser import parse_lyrics, LyricsFormat, syllabify_text, expand_lyrics_to_syllables
 from vsqx_generator import (
@@ -33,14 +38,148 @@ generate_vsqx = generate_output
 generate_multi_track_vsqx = generate_multi_track_output
 from channel_analyzer import ChannelAnalyzer, analyze_midi_channels
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize jsonify() responses with orjson (request parsing is unchanged)"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
 app = Flask(__name__, static_folder='static', static_url_path='')
+app.json = OrjsonProvider(app)
 CORS(app)
 
-# Ensure upload folder exists
-UPLOAD_FOLDER = tempfile.mkdtemp()
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max
 
+# Output format names accepted by /api/convert
+VERSION_MAP = {
+    'vsqx': OutputFormat.VSQX,
+    'vpr': OutputFormat.VPR,
+    'ust': OutputFormat.UST,
+    'ustx': OutputFormat.USTX,
+    'svp': OutputFormat.SVP,
+}
+
+# Number of matched notes returned by /api/preview
+PREVIEW_NOTE_LIMIT = 100
+
+# Parsed MIDI cache - analyze/preview/convert usually upload the same file,
+# so keep the most recent parses keyed by the SHA-256 of the upload.
+# A parse plus split holds roughly 50x the upload size, so only uploads up
+# to MIDI_CACHE_MAX_BYTES are cached (16 entries stay around 200 MB at worst)
+MIDI_CACHE_SIZE = 16
+MIDI_CACHE_MAX_BYTES = 256 * 1024
+_midi_cache = OrderedDict()
+_midi_cache_lock = threading.Lock()
+
+
+def _cache_get(key):
+    with _midi_cache_lock:
+        value = _midi_cache.get(key)
+        if value is not None:
+            _midi_cache.move_to_end(key)
+        return value
+
+
+def _cache_put(key, value):
+    with _midi_cache_lock:
+        _midi_cache[key] = value
+        _midi_cache.move_to_end(key)
+        while len(_midi_cache) > MIDI_CACHE_SIZE:
+            _midi_cache.popitem(last=False)
+
+
+def is_midi_upload(midi_file) -> bool:
+    """Check the Standard MIDI File magic before reading the whole upload"""
+    stream = midi_file.stream
+    head = stream.read(4)
+    stream.seek(0)
+    return head == b'MThd'
+
+
+def load_midi(midi_file):
+    """
+    Parse an uploaded MIDI file, reusing a previous parse of identical bytes
+    Returns (digest, midi_data); midi_data is shared and must not be mutated.
+    digest is None for uploads too large to cache
+    """
+    midi_bytes = midi_file.stream.read()
+    if len(midi_bytes) > MIDI_CACHE_MAX_BYTES:
+        return None, parse_midi(io.BytesIO(midi_bytes))
+    digest = hashlib.sha256(midi_bytes).hexdigest()
+    midi_data = _cache_get(('midi', digest))
+    if midi_data is None:
+        midi_data = parse_midi(io.BytesIO(midi_bytes))
+        _cache_put(('midi', digest), midi_data)
+    return digest, midi_data
+
+
+def split_tracks(digest, midi_data, analyzer):
+    """Run analyze_and_split, cached per MIDI digest and analyzer settings"""
+    if digest is None:
+        return analyzer.analyze_and_split(midi_data)
+    key = ('tracks', digest, analyzer.config['max_overlap_ms'], analyzer.config['split_logic'])
+    tracks = _cache_get(key)
+    if tracks is None:
+        tracks = analyzer.analyze_and_split(midi_data)
+        _cache_put(key, tracks)
+    return tracks
+
+
+def similarity_scorer(analyzer):
+    """
+    Per-request memoized wrapper around analyzer._calculate_similarity
+    Keyed by (channel_id, id(lyrics)) so each pair is scored only once
+    """
+    scores = {}
+
+    def score(track, lyrics):
+        if not lyrics:
+            return 0.0
+        key = (track.channel_id, id(lyrics))
+        if key not in scores:
+            scores[key] = analyzer._calculate_similarity(track, lyrics)
+        return scores[key]
+
+    return score
+
+
+def channel_lyrics_lookup(channel_lyrics_mapping, default_lyrics):
+    """
+    Per-request resolver for a track's lyrics
+    Channel-specific texts are parsed once per distinct string and shared
+    """
+    parsed = {}
+
+    def lyrics_for(track):
+        channel_key = str(track.channel_id)
+        if channel_key not in channel_lyrics_mapping:
+            return default_lyrics
+        text = channel_lyrics_mapping[channel_key]
+        if text not in parsed:
+            parsed[text] = parse_lyrics(text, LyricsFormat.PLAIN)
+        return parsed[text]
+
+    return lyrics_for
+
+
+def pick_best_track(tracks, lyrics, score):
+    """Return (track, similarity) of the track best matching lyrics"""
+    best_track = None
+    best_score = -1
+    for track in tracks:
+        track_score = score(track, lyrics)
+        if track_score > best_score:
+            best_score = track_score
+            best_track = track
+    return best_track, best_score
+
 
 @app.route('/')
 def index():
@@ -64,79 +203,71 @@ def convert():
             return jsonify({'error': 'No MIDI file provided'}), 400
         
         midi_file = request.files['midi']
+        if not is_midi_upload(midi_file):
+            return jsonify({'error': 'Not a valid MIDI file'}), 400
         lyrics_file = request.files.get('lyrics')
+        form = request.form.to_dict()
         
         # Get configuration options
-        vsqx_version = request.form.get('version', 'vsq4')
-        singer_name = request.form.get('singer', 'Default')
-        lyrics_format = request.form.get('lyrics_format', 'auto')
-        lyrics_source = request.form.get('lyrics_source', 'midi')
-        tempo_override = request.form.get('tempo')
-        multi_track = request.form.get('multi_track', 'false') == 'true'
-        selected_channel = request.form.get('selected_channel')
+        vsqx_version = form.get('version', 'vsq4')
+        singer_name = form.get('singer', 'Default')
+        lyrics_format = form.get('lyrics_format', 'auto')
+        lyrics_source = form.get('lyrics_source', 'midi')
+        tempo_override = form.get('tempo')
+        multi_track = form.get('multi_track', 'false') == 'true'
+        selected_channel = form.get('selected_channel')
         
         # New: Channel-specific lyrics mapping
-        channel_lyrics_raw = request.form.get('channel_lyrics_mapping', '{}')
+        channel_lyrics_raw = form.get('channel_lyrics_mapping', '{}')
         try:
             channel_lyrics_mapping = json.loads(channel_lyrics_raw)
         except json.JSONDecodeError:
             channel_lyrics_mapping = {}
         
         # Smart matching options
-        respect_word_boundaries = request.form.get('respect_word_boundaries', 'true') == 'true'
-        auto_syllabify = request.form.get('auto_syllabify', 'true') == 'true'
+        respect_word_boundaries = form.get('respect_word_boundaries', 'true') == 'true'
+        auto_syllabify = form.get('auto_syllabify', 'true') == 'true'
         try:
-            phrase_gap = float(request.form.get('phrase_gap_threshold', 400))
+            phrase_gap = float(form.get('phrase_gap_threshold', 400))
         except ValueError:
             phrase_gap = 400.0
         try:
-            overlap_ms = float(request.form.get('overlap_ms', 10))
+            overlap_ms = float(form.get('overlap_ms', 10))
         except ValueError:
             overlap_ms = 10.0
-        split_logic = request.form.get('split_logic', 'melody')
+        split_logic = form.get('split_logic', 'melody')
         
-        # Save MIDI file temporarily
-        midi_path = os.path.join(app.config['UPLOAD_FOLDER'], 'input.mid')
-        midi_file.save(midi_path)
-        
-        # Parse MIDI file
-        midi_data = parse_midi(midi_path)
+        # Parse MIDI file (cached by content)
+        digest, midi_data = load_midi(midi_file)
         
         # Analyze channels and split polyphonic parts
         analyzer = ChannelAnalyzer(config={'max_overlap_ms': overlap_ms, 'split_logic': split_logic})
-        tracks = analyzer.analyze_and_split(midi_data)
+        tracks = split_tracks(digest, midi_data, analyzer)
+        tracks_by_channel = {t.channel_id: t for t in tracks}
+        score = similarity_scorer(analyzer)
         
         # Get default lyrics (used when no channel-specific lyrics provided)
         default_lyrics = []
         if lyrics_source == 'midi':
             default_lyrics = midi_data.get('lyrics', [])
         elif lyrics_file:
-            lyrics_path = os.path.join(app.config['UPLOAD_FOLDER'], 'lyrics.txt')
-            lyrics_file.save(lyrics_path)
-            with open(lyrics_path, 'r', encoding='utf-8') as f:
-                lyrics_content = f.read()
+            lyrics_content = io.TextIOWrapper(lyrics_file.stream, encoding='utf-8').read()
             default_lyrics = parse_lyrics(lyrics_content, LyricsFormat(lyrics_format))
         
-        manual_lyrics = request.form.get('manual_lyrics', '').strip()
+        manual_lyrics = form.get('manual_lyrics', '').strip()
         if manual_lyrics:
             default_lyrics = parse_lyrics(manual_lyrics, LyricsFormat.PLAIN)
         
         # Override tempo if specified
+        tempo = midi_data['tempo']
         if tempo_override:
             try:
-                midi_data['tempo'] = float(tempo_override)
+                tempo = float(tempo_override)
             except ValueError:
                 pass
         
         # Parse version
-        version_map = {
-            'vsqx': OutputFormat.VSQX,
-            'vpr': OutputFormat.VPR,
-            'ust': OutputFormat.UST,
-            'ustx': OutputFormat.USTX,
-            'svp': OutputFormat.SVP,
-        }
-        version = version_map.get(vsqx_version, OutputFormat.VSQX)
+        version = VERSION_MAP.get(vsqx_version, OutputFormat.VSQX)
         
         # Create configured matcher
         matcher = create_matcher(
@@ -150,25 +281,16 @@ def convert():
         # Determine file extension and mime type from format
         file_ext = get_file_extension(version)
         mime_type = get_mime_type(version)
-        is_binary = (version == OutputFormat.VPR)  # VPR is a ZIP file
         
         if multi_track and len(tracks) > 1:
             # Generate multi-track project with per-channel lyrics
             track_data = []
+            lyrics_for = channel_lyrics_lookup(channel_lyrics_mapping, default_lyrics)
             
             for track in tracks:
                 # Get lyrics for this channel
-                channel_key = str(track.channel_id)
-                if channel_key in channel_lyrics_mapping:
-                    track_lyrics_text = channel_lyrics_mapping[channel_key]
-                    track_lyrics = parse_lyrics(track_lyrics_text, LyricsFormat.PLAIN)
-                else:
-                    track_lyrics = default_lyrics
-                
-                if track_lyrics:
-                    similarity = analyzer._calculate_similarity(track, track_lyrics)
-                else:
-                    similarity = 0.0
+                track_lyrics = lyrics_for(track)
+                similarity = score(track, track_lyrics)
                 
                 matched_notes = matcher.match(track.notes, track_lyrics)
                 
@@ -184,51 +306,32 @@ def convert():
             
             content = generate_multi_track_output(
                 tracks=track_data,
-                tempo=midi_data['tempo'],
+                tempo=tempo,
                 time_signature=midi_data['time_signature'],
                 output_format=version,
                 singer_name='Default'
             )
             
-            output_path = os.path.join(app.config['UPLOAD_FOLDER'], f'output{file_ext}')
-            if is_binary:
-                with open(output_path, 'wb') as f:
-                    f.write(content)
-            else:
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-            
-            return send_file(
-                output_path,
-                mimetype=mime_type,
-                as_attachment=True,
-                download_name=f'{base_filename}_multitrack{file_ext}'
-            )
+            return send_output(content, mime_type, f'{base_filename}_multitrack{file_ext}')
         else:
             # Single track mode
             if selected_channel is not None:
                 try:
-                    channel_idx = int(selected_channel)
-                    target_track = next((t for t in tracks if t.channel_id == channel_idx), None)
-                except (ValueError, StopIteration):
+                    target_track = tracks_by_channel.get(int(selected_channel))
+                except ValueError:
                     target_track = None
             else:
                 target_track = None
             
             if target_track is None:
                 if default_lyrics and tracks:
-                    best_score = -1
-                    for track in tracks:
-                        score = analyzer._calculate_similarity(track, default_lyrics)
-                        if score > best_score:
-                            best_score = score
-                            target_track = track
+                    target_track, _ = pick_best_track(tracks, default_lyrics, score)
                 elif tracks:
                     target_track = analyzer.get_best_vocal_track(tracks)
             
             if target_track:
                 notes_to_use = target_track.notes
-                similarity = analyzer._calculate_similarity(target_track, default_lyrics) if default_lyrics else 0.0
+                similarity = score(target_track, default_lyrics)
             else:
                 notes_to_use = midi_data['notes']
                 similarity = 0.0
@@ -237,31 +340,17 @@ def convert():
             
             content = generate_vsqx(
                 notes=matched_notes,
-                tempo=midi_data['tempo'],
+                tempo=tempo,
                 time_signature=midi_data['time_signature'],
-                version=version,
+                output_format=version,
                 singer_name=singer_name,
                 similarity_score=similarity
             )
             
-            output_path = os.path.join(app.config['UPLOAD_FOLDER'], f'output{file_ext}')
-            if is_binary:
-                with open(output_path, 'wb') as f:
-                    f.write(content)
-            else:
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-            
-            return send_file(
-                output_path,
-                mimetype=mime_type,
-                as_attachment=True,
-                download_name=f'{base_filename}{file_ext}'
-            )
+            return send_output(content, mime_type, f'{base_filename}{file_ext}')
         
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        app.logger.exception('%s failed', request.path)
         return jsonify({'error': str(e)}), 500
 
 
@@ -278,67 +367,63 @@ def preview():
             return jsonify({'error': 'No MIDI file provided'}), 400
         
         midi_file = request.files['midi']
+        if not is_midi_upload(midi_file):
+            return jsonify({'error': 'Not a valid MIDI file'}), 400
         lyrics_file = request.files.get('lyrics')
+        form = request.form.to_dict()
         
-        lyrics_format = request.form.get('lyrics_format', 'auto')
-        lyrics_source = request.form.get('lyrics_source', 'midi')
-        selected_channel = request.form.get('selected_channel')
+        lyrics_format = form.get('lyrics_format', 'auto')
+        lyrics_source = form.get('lyrics_source', 'midi')
+        selected_channel = form.get('selected_channel')
         
         # Smart matching options
-        respect_word_boundaries = request.form.get('respect_word_boundaries', 'true') == 'true'
-        auto_syllabify = request.form.get('auto_syllabify', 'true') == 'true'
+        respect_word_boundaries = form.get('respect_word_boundaries', 'true') == 'true'
+        auto_syllabify = form.get('auto_syllabify', 'true') == 'true'
         try:
-            phrase_gap = float(request.form.get('phrase_gap_threshold', 400))
+            phrase_gap = float(form.get('phrase_gap_threshold', 400))
         except ValueError:
             phrase_gap = 400.0
         try:
-            overlap_ms = float(request.form.get('overlap_ms', 10))
+            overlap_ms = float(form.get('overlap_ms', 10))
         except ValueError:
             overlap_ms = 10.0
-        split_logic = request.form.get('split_logic', 'melody')
+        split_logic = form.get('split_logic', 'melody')
         
         # Channel-specific lyrics mapping
-        channel_lyrics_raw = request.form.get('channel_lyrics_mapping', '{}')
+        channel_lyrics_raw = form.get('channel_lyrics_mapping', '{}')
         try:
             channel_lyrics_mapping = json.loads(channel_lyrics_raw)
         except json.JSONDecodeError:
             channel_lyrics_mapping = {}
         
-        # Save and parse MIDI
-        midi_path = os.path.join(app.config['UPLOAD_FOLDER'], 'preview.mid')
-        midi_file.save(midi_path)
-        midi_data = parse_midi(midi_path)
+        # Parse MIDI (cached by content)
+        digest, midi_data = load_midi(midi_file)
         
         # Analyze channels
         analyzer = ChannelAnalyzer(config={'max_overlap_ms': overlap_ms, 'split_logic': split_logic})
-        tracks = analyzer.analyze_and_split(midi_data)
+        tracks = split_tracks(digest, midi_data, analyzer)
+        tracks_by_channel = {t.channel_id: t for t in tracks}
+        score = similarity_scorer(analyzer)
         
         # Get default lyrics
         default_lyrics = []
         if lyrics_source == 'midi':
             default_lyrics = midi_data.get('lyrics', [])
         elif lyrics_file:
-            lyrics_path = os.path.join(app.config['UPLOAD_FOLDER'], 'preview_lyrics.txt')
-            lyrics_file.save(lyrics_path)
-            with open(lyrics_path, 'r', encoding='utf-8') as f:
-                lyrics_content = f.read()
+            lyrics_content = io.TextIOWrapper(lyrics_file.stream, encoding='utf-8').read()
             default_lyrics = parse_lyrics(lyrics_content, LyricsFormat(lyrics_format))
         
-        manual_lyrics = request.form.get('manual_lyrics', '').strip()
+        manual_lyrics = form.get('manual_lyrics', '').strip()
         if manual_lyrics:
             default_lyrics = parse_lyrics(manual_lyrics, LyricsFormat.PLAIN)
         
         # Calculate similarity for each track
         track_info = []
+        lyrics_for = channel_lyrics_lookup(channel_lyrics_mapping, default_lyrics)
         for track in tracks:
             # Use channel-specific lyrics if available
-            channel_key = str(track.channel_id)
-            if channel_key in channel_lyrics_mapping:
-                track_lyrics = parse_lyrics(channel_lyrics_mapping[channel_key], LyricsFormat.PLAIN)
-            else:
-                track_lyrics = default_lyrics
-            
-            similarity = analyzer._calculate_similarity(track, track_lyrics) if track_lyrics else 0.0
+            track_lyrics = lyrics_for(track)
+            similarity = score(track, track_lyrics)
             
             track_info.append({
                 'channel_id': track.channel_id,
@@ -347,7 +432,7 @@ def preview():
                 'is_polyphonic': track.is_polyphonic,
                 'similarity': round(similarity * 100, 1),
                 'original_channel': track.original_channel,
-                'has_custom_lyrics': channel_key in channel_lyrics_mapping
+                'has_custom_lyrics': str(track.channel_id) in channel_lyrics_mapping
             })
         
         track_info.sort(key=lambda t: -t['similarity'])
@@ -355,19 +440,12 @@ def preview():
         # Select track for preview
         if selected_channel is not None:
             try:
-                channel_idx = int(selected_channel)
-                target_track = next((t for t in tracks if t.channel_id == channel_idx), None)
-            except (ValueError, StopIteration):
+                target_track = tracks_by_channel.get(int(selected_channel))
+            except ValueError:
                 target_track = tracks[0] if tracks else None
         else:
             if default_lyrics and tracks:
-                best_score = -1
-                target_track = None
-                for track in tracks:
-                    score = analyzer._calculate_similarity(track, default_lyrics)
-                    if score > best_score:
-                        best_score = score
-                        target_track = track
+                target_track, _ = pick_best_track(tracks, default_lyrics, score)
             elif tracks:
                 target_track = analyzer.get_best_vocal_track(tracks)
             else:
@@ -375,14 +453,9 @@ def preview():
         
         # Get lyrics for selected track
         if target_track:
-            channel_key = str(target_track.channel_id)
-            if channel_key in channel_lyrics_mapping:
-                track_lyrics = parse_lyrics(channel_lyrics_mapping[channel_key], LyricsFormat.PLAIN)
-            else:
-                track_lyrics = default_lyrics
-            
+            track_lyrics = lyrics_for(target_track)
             notes_to_use = target_track.notes
-            selected_similarity = analyzer._calculate_similarity(target_track, track_lyrics) if track_lyrics else 0.0
+            selected_similarity = score(target_track, track_lyrics)
         else:
             notes_to_use = midi_data['notes']
             track_lyrics = default_lyrics
@@ -395,6 +468,7 @@ def preview():
             phrase_gap_threshold=phrase_gap
         )
         matched_notes = matcher.match(notes_to_use, track_lyrics)
+        preview_notes = matched_notes[:PREVIEW_NOTE_LIMIT]
         
         # Build preview response
         preview_data = {
@@ -418,9 +492,9 @@ def preview():
                     'is_word_end': n.get('is_word_end', True),
                     'original_word': n.get('original_word', '')
                 }
-                for n in matched_notes[:100]
+                for n in preview_notes
             ],
-            'has_more': len(matched_notes) > 100,
+            'has_more': len(matched_notes) > PREVIEW_NOTE_LIMIT,
             'matching_options': {
                 'respect_word_boundaries': respect_word_boundaries,
                 'auto_syllabify': auto_syllabify
@@ -430,8 +504,7 @@ def preview():
         return jsonify(preview_data)
         
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        app.logger.exception('%s failed', request.path)
         return jsonify({'error': str(e)}), 500
 
 
@@ -446,34 +519,28 @@ def analyze():
             return jsonify({'error': 'No MIDI file provided'}), 400
         
         midi_file = request.files['midi']
+        if not is_midi_upload(midi_file):
+            return jsonify({'error': 'Not a valid MIDI file'}), 400
+        form = request.form.to_dict()
         
-        # Save and parse MIDI
-        midi_path = os.path.join(app.config['UPLOAD_FOLDER'], 'analyze.mid')
-        midi_file.save(midi_path)
-        midi_data = parse_midi(midi_path)
+        # Parse MIDI (cached by content)
+        digest, midi_data = load_midi(midi_file)
         
         # Analyze channels
         try:
-            overlap_ms = float(request.form.get('overlap_ms', 10))
+            overlap_ms = float(form.get('overlap_ms', 10))
         except ValueError:
             overlap_ms = 10.0
-        split_logic = request.form.get('split_logic', 'melody')
+        split_logic = form.get('split_logic', 'melody')
         
         analyzer = ChannelAnalyzer(config={'max_overlap_ms': overlap_ms, 'split_logic': split_logic})
-        tracks = analyzer.analyze_and_split(midi_data)
+        tracks = split_tracks(digest, midi_data, analyzer)
         best_track = analyzer.get_best_vocal_track(tracks)
         
         # Build response
         track_info = []
         for track in tracks:
-            pitches = [n['pitch'] for n in track.notes]
-            min_pitch = min(pitches) if pitches else 0
-            max_pitch = max(pitches) if pitches else 0
-            avg_pitch = sum(pitches) / len(pitches) if pitches else 0
-            
-            # Get duration info
-            durations = [n['duration'] for n in track.notes]
-            avg_duration = sum(durations) / len(durations) if durations else 0
+            min_pitch, max_pitch, avg_pitch, avg_duration = note_stats(track.notes)
             
             track_info.append({
                 'channel_id': track.channel_id,
@@ -505,8 +572,7 @@ def analyze():
         })
         
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        app.logger.exception('%s failed', request.path)
         return jsonify({'error': str(e)}), 500
 
 
@@ -536,10 +602,9 @@ def syllabify_endpoint():
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/singers', methods=['GET'])
-def get_singers():
+def _build_singers_response():
     """
-    Return list of available singers/voicebanks
+    Build the /api/singers payload
     Organized by Vocaloid version
     """
     by_version = {}
@@ -565,19 +630,61 @@ def get_singers():
                 'singers': by_version[v]
             })
     
-    return jsonify({
+    return {
         'singers': SINGERS,
         'by_version': ordered,
         'total': len(SINGERS)
-    })
+    }
+
+
+# SINGERS never changes at runtime, so the payload is built once at import
+SINGERS_RESPONSE = _build_singers_response()
+
+
+@app.route('/api/singers', methods=['GET'])
+def get_singers():
+    """
+    Return list of available singers/voicebanks
+    Organized by Vocaloid version
+    """
+    return jsonify(SINGERS_RESPONSE)
+
+
+def send_output(content: bytes, mime_type: str, download_name: str) -> Response:
+    """
+    Send generated project bytes as a download
+    send_file streams the buffer in chunks with Content-Length set and
+    handles non-ASCII download names, so no temporary copy is made
+    """
+    return send_file(
+        io.BytesIO(content),
+        mimetype=mime_type,
+        as_attachment=True,
+        download_name=download_name
+    )
+
+
+def note_stats(notes: list) -> tuple:
+    """Return (min_pitch, max_pitch, avg_pitch, avg_duration_ms) for a note list"""
+    if not notes:
+        return 0, 0, 0, 0
+    count = len(notes)
+    pitches = list(map(itemgetter('pitch'), notes))
+    avg_duration = sum(map(itemgetter('duration'), notes)) / count
+    return min(pitches), max(pitches), sum(pitches) / count, avg_duration
+
+
+NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+
+# Precomputed names for the 128 valid MIDI note numbers
+_NOTE_NAME_TABLE = tuple(f"{NOTE_NAMES[i % 12]}{(i // 12) - 1}" for i in range(128))
 
 
 def note_name(midi_note: int) -> str:
     """Convert MIDI note number to note name (e.g., 60 -> C4)"""
-    notes = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-    octave = (midi_note // 12) - 1
-    note = notes[midi_note % 12]
-    return f"{note}{octave}"
+    if 0 <= midi_note < 128:
+        return _NOTE_NAME_TABLE[midi_note]
+    return f"{NOTE_NAMES[midi_note % 12]}{(midi_note // 12) - 1}"
 
 
 if __name__ == '__main__':
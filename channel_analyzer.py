@@ -3,20 +3,38 @@ Channel Analyzer Module
 Handles polyphonic instrument splitting and channel-to-lyrics matching
 """
 
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional
 from dataclasses import dataclass
-import copy
+from collections import defaultdict
+from itertools import islice
+from operator import attrgetter, itemgetter
+import heapq
 
+# Standard MIDI channel 10 (0-indexed) carries percussion
+PERCUSSION_CHANNEL = 9
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ChannelInfo:
-    """Information about a MIDI channel or split track"""
+    """Information about a MIDI channel or split track (shared, so read-only)"""
     channel_id: int
     track_name: str
     notes: List[Dict]
-    note_count: int
     is_polyphonic: bool
     original_channel: int  # Original channel before splitting
+    avg_pitch: Optional[float] = None  # Mean pitch, computed from notes when omitted
+    
+    def __post_init__(self):
+        if self.avg_pitch is None:
+            # One C-level pass over the notes, without an intermediate list
+            notes = self.notes
+            avg_pitch = sum(map(itemgetter('pitch'), notes)) / len(notes) if notes else 0.0
+            object.__setattr__(self, 'avg_pitch', avg_pitch)
+    
+    @property
+    def note_count(self) -> int:
+        """Number of notes (derived, so it can never drift from notes)"""
+        return len(self.notes)
 
 
 class ChannelAnalyzer:
@@ -40,49 +58,46 @@ class ChannelAnalyzer:
         
         Returns list of ChannelInfo objects, each representing a monophonic track
         """
-        notes = midi_data.get('notes', [])
-        
-        # Group notes by channel
-        channels = self._group_by_channel(notes)
+        # Group notes by channel (parse_midi already provides the groups)
+        channels = midi_data.get('notes_by_channel')
+        if channels is None:
+            channels = self._group_by_channel(midi_data.get('notes', []))
         
         # Split polyphonic channels into monophonic tracks
         monophonic_tracks = []
         track_id = 0
+        min_notes = self.config['min_notes_per_track']
+        # Stricter for split voices (harmonies) to avoid UI clutter
+        min_harmony_notes = min_notes * 2
         
         for channel_num, channel_notes in channels.items():
             # Standard MIDI Channel 10 is usually percussion - skip it for vocals
-            if channel_num == 9: # 0-indexed channel 10
+            if channel_num == PERCUSSION_CHANNEL:
                 continue
                 
             # 1. Try to "heal" minor overlaps first to avoid splitting
-            healed_notes = self._heal_overlaps(channel_notes)
+            healed_notes, is_poly = self._heal_and_classify(channel_notes)
             
-            if self._is_polyphonic(healed_notes):
+            if is_poly:
                 # Split into multiple monophonic tracks
                 split_tracks = self._split_polyphonic(healed_notes)
                 for i, track_notes in enumerate(split_tracks):
-                    # Stricter for split voices (harmonies) to avoid UI clutter
-                    min_notes = self.config['min_notes_per_track']
-                    if i > 0:
-                        min_notes *= 2 # Harmonies need more substance to be shown
-                        
-                    if len(track_notes) >= min_notes:
+                    # Harmonies need more substance to be shown
+                    if len(track_notes) >= (min_harmony_notes if i else min_notes):
                         monophonic_tracks.append(ChannelInfo(
                             channel_id=track_id,
                             track_name=f"Ch {channel_num} (Voice {i+1})",
                             notes=track_notes,
-                            note_count=len(track_notes),
                             is_polyphonic=True,
                             original_channel=channel_num
                         ))
                         track_id += 1
             else:
-                if len(healed_notes) >= self.config['min_notes_per_track']:
+                if len(healed_notes) >= min_notes:
                     monophonic_tracks.append(ChannelInfo(
                         channel_id=track_id,
                         track_name=f"Channel {channel_num}",
                         notes=healed_notes,
-                        note_count=len(healed_notes),
                         is_polyphonic=False,
                         original_channel=channel_num
                     ))
@@ -91,59 +106,62 @@ class ChannelAnalyzer:
         return monophonic_tracks
     
     def _group_by_channel(self, notes: List[Dict]) -> Dict[int, List[Dict]]:
-        """Group notes by MIDI channel"""
-        channels = {}
+        """Group notes by MIDI channel, leaving out percussion"""
+        channels = defaultdict(list)
         for note in notes:
-            ch = note.get('channel', 0)
-            if ch not in channels:
-                channels[ch] = []
-            channels[ch].append(note)
+            channel = note.get('channel', 0)
+            # Percussion is skipped by analyze_and_split, so don't bucket it
+            if channel != PERCUSSION_CHANNEL:
+                channels[channel].append(note)
         
-        # Sort each channel by start time
-        for ch in channels:
-            channels[ch].sort(key=lambda n: n['start'])
+        # Sort each channel by start time (parse_midi output is already
+        # ordered, which timsort handles in a single linear pass)
+        by_start = itemgetter('start')
+        for channel_notes in channels.values():
+            channel_notes.sort(key=by_start)
         
-        return channels
+        return dict(channels)
     
-    def _heal_overlaps(self, notes: List[Dict]) -> List[Dict]:
+    def _heal_and_classify(self, notes: List[Dict]) -> Tuple[List[Dict], bool]:
         """
         Attempts to fix minor overlaps by shortening previous notes.
         This preserves monophonic tracks that just have sloppy MIDI timing.
+        
+        Returns (healed_notes, is_polyphonic), where is_polyphonic tells
+        whether overlaps remain after healing.
         """
         if not notes:
-            return []
-            
-        healed = [copy.deepcopy(notes[0])]
+            return [], False
+        
+        # Input notes are shared with the parsed MIDI data, so only a note
+        # that actually gets shortened is copied
+        previous = notes[0]
+        prev_end = previous['start'] + previous['duration']
+        healed = [previous]
         limit = self.config['auto_heal_limit_ms']
+        max_overlap = self.config['max_overlap_ms']
+        is_poly = False
         
-        for i in range(1, len(notes)):
-            current = copy.deepcopy(notes[i])
-            previous = healed[-1]
-            
-            prev_end = previous['start'] + previous['duration']
-            overlap = prev_end - current['start']
+        for current in islice(notes, 1, None):
+            start = current['start']
+            overlap = prev_end - start
             
             if 0 < overlap <= limit:
                 # Minor overlap - shorten previous note
-                previous['duration'] = max(1, previous['duration'] - overlap)
+                duration = max(1, previous['duration'] - overlap)
+                healed[-1] = dict(previous, duration=duration)
+                prev_end = previous['start'] + duration
             
-            healed.append(current)
+            # If next note starts before the (healed) previous one ends (with tolerance).
+            # Healing has to run to the end, but the check stops once polyphony is found.
+            if not is_poly and start < prev_end - max_overlap:
+                is_poly = True
             
-        return healed
-        
-    def _is_polyphonic(self, notes: List[Dict]) -> bool:
-        """Check if a set of notes contains polyphonic sections"""
-        max_overlap = self.config['max_overlap_ms']
-        
-        for i in range(len(notes) - 1):
-            note_end = notes[i]['start'] + notes[i]['duration']
-            next_start = notes[i + 1]['start']
+            healed.append(current)
+            previous = current
+            prev_end = start + current['duration']
             
-            # If next note starts before current ends (with tolerance)
-            if next_start < note_end - max_overlap:
-                return True
-        
-        return False
+        return healed, is_poly
     
     def _split_polyphonic(self, notes: List[Dict]) -> List[List[Dict]]:
         """
@@ -155,36 +173,38 @@ class ChannelAnalyzer:
         
         # Sort logic based on config
         if self.config.get('split_logic') == 'melody':
-            # Sort notes by start time, then by pitch (highest first) to keep melody in top voice
-            sorted_notes = sorted(notes, key=lambda n: (n['start'], -n['pitch']))
+            # Sort notes by start time, then by pitch (highest first) to keep melody in top voice.
+            # Two stable C-level sorts give the same order as a (start, -pitch) key.
+            sorted_notes = sorted(notes, key=itemgetter('pitch'), reverse=True)
+            sorted_notes.sort(key=itemgetter('start'))
         else:
             # Strictly chronological
-            sorted_notes = sorted(notes, key=lambda n: n['start'])
+            sorted_notes = sorted(notes, key=itemgetter('start'))
         
+        # Each note goes to the lowest-numbered voice it fits after.
+        # Notes arrive in start order, so once a voice's last note has ended
+        # it stays available until it is reused: busy voices sit in a heap
+        # keyed by end time and move to a heap of free voice indices.
+        busy = []  # (last_end, voice_idx)
+        free = []  # voice_idx
+        
+        # Notes are not modified here, so voices hold references to them
         for note in sorted_notes:
-            note_copy = copy.deepcopy(note)
-            assigned = False
+            start = note['start']
             
-            # Try to assign to the first available voice where it doesn't overlap
-            for voice in voices:
-                if not voice:
-                    voice.append(note_copy)
-                    assigned = True
-                    break
-                
-                # Check if note fits after the last note in this voice
-                last_note = voice[-1]
-                last_end = last_note['start'] + last_note['duration']
-                
-                # VSQX is strict: next note's start MUST be >= previous note's end
-                if note_copy['start'] >= last_end - 1: # 1ms overlap tolerance for rounding
-                    voice.append(note_copy)
-                    assigned = True
-                    break
+            # VSQX is strict: next note's start MUST be >= previous note's end
+            while busy and start >= busy[0][0] - 1:  # 1ms overlap tolerance for rounding
+                heapq.heappush(free, heapq.heappop(busy)[1])
+            
+            if free:
+                voice_idx = heapq.heappop(free)
+                voices[voice_idx].append(note)
+            else:
+                # Create new voice if no existing voice can take this note
+                voice_idx = len(voices)
+                voices.append([note])
             
-            # Create new voice if no existing voice can take this note
-            if not assigned:
-                voices.append([note_copy])
+            heapq.heappush(busy, (start + note['duration'], voice_idx))
         
         return voices
     
@@ -214,18 +234,23 @@ class ChannelAnalyzer:
         used_lyrics = set()
         
         # Sort tracks by note count (prefer tracks with more notes)
-        sorted_tracks = sorted(tracks, key=lambda t: -t.note_count)
+        sorted_tracks = sorted(tracks, key=attrgetter('note_count'), reverse=True)
+        
+        # Similarity inputs are computed once, not per (track, lyrics) pair
+        lyric_counts = [len(lyrics) for lyrics in lyrics_groups]
         
         for track in sorted_tracks:
             best_match = None
             best_score = -1.0
             best_idx = -1
+            note_count = track.note_count
+            range_score = self._range_score(track)
             
             for i, lyrics in enumerate(lyrics_groups):
                 if i in used_lyrics:
                     continue
                 
-                score = self._calculate_similarity(track, lyrics)
+                score = self._score(note_count, range_score, lyric_counts[i])
                 if score > best_score:
                     best_score = score
                     best_match = lyrics
@@ -251,39 +276,36 @@ class ChannelAnalyzer:
         if not lyrics:
             return 0.0
         
-        note_count = track.note_count
-        syllable_count = len(lyrics)
-        
+        return self._score(track.note_count, self._range_score(track), len(lyrics))
+    
+    def _score(self, note_count: int, range_score: float, syllable_count: int) -> float:
+        """Similarity from precomputed inputs (see _calculate_similarity)"""
         # Count similarity (most important)
         if note_count == 0 or syllable_count == 0:
             count_score = 0.0
         else:
-            ratio = min(note_count, syllable_count) / max(note_count, syllable_count)
-            count_score = ratio
+            count_score = min(note_count, syllable_count) / max(note_count, syllable_count)
         
-        # Pitch range score (prefer vocal range)
-        pitches = [n['pitch'] for n in track.notes]
-        if pitches:
-            avg_pitch = sum(pitches) / len(pitches)
-            min_vocal, max_vocal = self.config['prefer_melody_range']
-            mid_vocal = (min_vocal + max_vocal) / 2
-            
-            if min_vocal <= avg_pitch <= max_vocal:
-                # Within vocal range
-                range_score = 1.0 - abs(avg_pitch - mid_vocal) / ((max_vocal - min_vocal) / 2) * 0.3
-            else:
-                # Outside vocal range - penalize
-                if avg_pitch < min_vocal:
-                    range_score = max(0, 0.5 - (min_vocal - avg_pitch) / 24)
-                else:
-                    range_score = max(0, 0.5 - (avg_pitch - max_vocal) / 24)
-        else:
-            range_score = 0.5
+        # Weighted combination with the pitch range score (prefer vocal range)
+        return count_score * 0.7 + range_score * 0.3
+    
+    def _range_score(self, track: ChannelInfo) -> float:
+        """Pitch range part of the similarity score"""
+        if not track.notes:
+            return 0.5
         
-        # Weighted combination
-        similarity = count_score * 0.7 + range_score * 0.3
+        avg_pitch = track.avg_pitch
+        min_vocal, max_vocal = self.config['prefer_melody_range']
         
-        return similarity
+        # Distance outside the vocal range (at most one side is non-zero)
+        outside = max(0, min_vocal - avg_pitch) + max(0, avg_pitch - max_vocal)
+        if outside:
+            # Outside vocal range - penalize
+            return max(0, 0.5 - outside / 24)
+        
+        # Within vocal range
+        mid_vocal = (min_vocal + max_vocal) / 2
+        return 1.0 - abs(avg_pitch - mid_vocal) / ((max_vocal - min_vocal) / 2) * 0.3
     
     def get_best_vocal_track(self, tracks: List[ChannelInfo]) -> ChannelInfo:
         """
@@ -292,24 +314,21 @@ class ChannelAnalyzer:
         if not tracks:
             return None
         
+        min_vocal, max_vocal = self.config['prefer_melody_range']
+        max_notes = max(t.note_count for t in tracks)
+        
         def track_score(track: ChannelInfo) -> float:
             # Factors: note count, pitch range, monophonic preference
-            notes = track.notes
-            if not notes:
+            if not track.notes:
                 return 0
             
-            pitches = [n['pitch'] for n in notes]
-            avg_pitch = sum(pitches) / len(pitches)
-            min_vocal, max_vocal = self.config['prefer_melody_range']
-            
             # Pitch range score
-            if min_vocal <= avg_pitch <= max_vocal:
+            if min_vocal <= track.avg_pitch <= max_vocal:
                 pitch_score = 1.0
             else:
                 pitch_score = 0.5
             
             # Note count score (normalized)
-            max_notes = max(t.note_count for t in tracks)
             count_score = track.note_count / max_notes if max_notes > 0 else 0
             
             # Prefer non-polyphonic (already split)
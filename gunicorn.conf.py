@@ -0,0 +1,22 @@
+"""
+Gunicorn configuration for serving the converter in production
+Usage: gunicorn app:app
+"""
+
+import os
+
+# Local only by default, like `python app.py`; set BIND=0.0.0.0:5000 to
+# serve other machines
+bind = os.environ.get('BIND', '127.0.0.1:5000')
+
+# Load the app before forking so SINGERS and the precomputed singer
+# response are shared copy-on-write between workers
+preload_app = True
+# Each worker keeps its own parsed MIDI cache (up to ~200 MB when full),
+# so memory grows with the worker count; raise WEB_CONCURRENCY as RAM allows
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_class = 'gthread'
+threads = 2
+
+# Large MIDI files can take a while to match and export
+timeout = 120
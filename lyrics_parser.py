@@ -6,6 +6,7 @@ Includes advanced syllabification using pyphen and fallback algorithms
 
 import re
 from enum import Enum
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
 import pyphen
 
@@ -14,6 +15,25 @@ _dic_en = pyphen.Pyphen(lang='en_US')
 _dic_es = pyphen.Pyphen(lang='es')
 _dic_ja = None  # Japanese handled separately
 
+# Pyphen dictionary per language code; others use syllabify_basic
+_PYPHEN_DICTS = {'en': _dic_en, 'es': _dic_es}
+
+# Patterns are compiled once at import rather than looked up per call
+_LRC_DETECT_RE = re.compile(r'\[\d{1,2}:\d{2}[\.:]?\d{0,3}\]')
+_SRT_DETECT_RE = re.compile(r'^\d+\s*\n\d{2}:\d{2}:\d{2},\d{3}\s*-->', re.MULTILINE)
+_CSV_DETECT_RE = re.compile(r'^\d+\.?\d*\s*,\s*\S+', re.MULTILINE)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_LEAD_PUNCT_RE = re.compile(r'^[^\w\']+')
+_TRAIL_PUNCT_RE = re.compile(r'[^\w\']+$')
+
+# Vowels for syllabify_basic, as a set for O(1) membership tests
+_VOWELS = frozenset('aeiouy')
+
+# ASCII characters matched by [^\w'], for trimming with str.strip
+_ASCII_NON_WORD = ''.join(
+    ch for ch in map(chr, range(128)) if not (ch.isalnum() or ch in "_'")
+)
+
 # Common English word syllable overrides for better accuracy
 # These are words where algorithmic syllabification often fails
 SYLLABLE_OVERRIDES = {
@@ -81,6 +101,8 @@ class LyricsFormat(Enum):
 
 class LyricUnit:
     """Represents a single lyric unit (syllable or word) with metadata"""
+    __slots__ = ('text', 'time', 'is_word_start', 'is_word_end', 'original_word')
+    
     def __init__(self, text: str, time: Optional[float] = None, 
                  is_word_start: bool = True, is_word_end: bool = True,
                  original_word: Optional[str] = None):
@@ -127,27 +149,31 @@ def detect_format(content: str) -> LyricsFormat:
     """Auto-detect the lyrics format from content"""
     content = content.strip()
     
+    # Each pattern needs a marker character; a substring test (memchr in C)
+    # rules most content out before any regex runs
+    
     # Check for LRC format [mm:ss.xx]
-    if re.search(r'\[\d{1,2}:\d{2}[\.:]?\d{0,3}\]', content):
+    if '[' in content and _LRC_DETECT_RE.search(content):
         return LyricsFormat.LRC
     
     # Check for SRT format (numbered entries with timestamps)
-    if re.search(r'^\d+\s*\n\d{2}:\d{2}:\d{2},\d{3}\s*-->', content, re.MULTILINE):
+    if '-->' in content and _SRT_DETECT_RE.search(content):
         return LyricsFormat.SRT
     
     # Check for timed CSV (starts with time)
-    if re.search(r'^\d+\.?\d*\s*,\s*\S+', content, re.MULTILINE):
+    if ',' in content and _CSV_DETECT_RE.search(content):
         return LyricsFormat.TIMED_CSV
     
     # Check if content has hyphenated words (pre-syllabified)
-    words = content.split()
-    hyphenated_count = sum(1 for w in words if '-' in w and not w.startswith('-') and not w.endswith('-'))
-    if hyphenated_count > len(words) * 0.3:  # More than 30% hyphenated
-        return LyricsFormat.PRE_SYLLABIFIED
-    
-    # Check if each line is a single word/syllable
-    lines = [l.strip() for l in content.split('\n') if l.strip()]
-    if lines and all(len(l.split()) == 1 for l in lines):
+    if '-' in content:
+        words = content.split()
+        hyphenated_count = sum(1 for w in words if '-' in w and not w.startswith('-') and not w.endswith('-'))
+        if hyphenated_count > len(words) * 0.3:  # More than 30% hyphenated
+            return LyricsFormat.PRE_SYLLABIFIED
+    
+    # Check if each line is a single word/syllable (blank lines are ignored;
+    # stops at the first line with several words)
+    if content and all(len(line.split()) <= 1 for line in content.split('\n')):
         return LyricsFormat.SYLLABLE
     
     # Default to plain text
@@ -160,38 +186,8 @@ def parse_plain(content: str) -> List[Dict]:
     Treats words as whole units - does NOT auto-syllabify
     Use parse_plain_syllabified() if you want auto-syllabification
     """
-    lyrics = []
-    
-    # Replace common separators
-    content = content.replace('\r\n', '\n')
-    content = content.replace('\r', '\n')
-    
-    # Split on whitespace
-    words = content.split()
-    
-    for word in words:
-        # Handle hyphenated syllables (e.g., "hel-lo" becomes "hel", "lo")
-        if '-' in word and not word.startswith('-') and not word.endswith('-'):
-            syllables = word.split('-')
-            for i, syl in enumerate(syllables):
-                if syl.strip():
-                    lyrics.append({
-                        'text': clean_syllable(syl),
-                        'is_word_start': i == 0,
-                        'is_word_end': i == len(syllables) - 1,
-                        'original_word': word.replace('-', '')
-                    })
-        else:
-            if word.strip():
-                cleaned = clean_syllable(word)
-                lyrics.append({
-                    'text': cleaned,
-                    'is_word_start': True,
-                    'is_word_end': True,
-                    'original_word': cleaned
-                })
-    
-    return lyrics
+    # Punctuation-only words are kept as empty units
+    return _parse_words(content, skip_empty=False)
 
 
 def parse_pre_syllabified(content: str) -> List[Dict]:
@@ -199,28 +195,35 @@ def parse_pre_syllabified(content: str) -> List[Dict]:
     Parse lyrics that are already syllabified with hyphens
     E.g., "hel-lo world I won-der why"
     """
+    return _parse_words(content, skip_empty=True)
+
+
+def _parse_words(content: str, skip_empty: bool) -> List[Dict]:
+    """
+    Shared body of parse_plain and parse_pre_syllabified
+    Hyphenated words (e.g., "hel-lo") become one unit per syllable
+    """
     lyrics = []
-    content = content.replace('\r\n', '\n').replace('\r', '\n')
-    
-    words = content.split()
     
-    for word in words:
+    # Split on whitespace (this covers \r\n and \r line endings too)
+    for word in content.split():
         if '-' in word and not word.startswith('-') and not word.endswith('-'):
             # Pre-syllabified word
             syllables = word.split('-')
             original = word.replace('-', '')
+            last = len(syllables) - 1
             for i, syl in enumerate(syllables):
                 if syl.strip():
                     lyrics.append({
                         'text': clean_syllable(syl),
                         'is_word_start': i == 0,
-                        'is_word_end': i == len(syllables) - 1,
+                        'is_word_end': i == last,
                         'original_word': original
                     })
         else:
             # Single syllable word
             cleaned = clean_syllable(word)
-            if cleaned:
+            if cleaned or not skip_empty:
                 lyrics.append({
                     'text': cleaned,
                     'is_word_start': True,
@@ -237,75 +240,163 @@ def parse_lrc(content: str) -> List[Dict]:
     Format: [mm:ss.xx]text or [mm:ss:xx]text
     """
     lyrics = []
+    length = len(content)
+    pos = 0
     
-    # Pattern for LRC timestamps - more flexible
-    pattern = r'\[(\d{1,2}):(\d{2})[\.:]+(\d{1,3})\]([^\[\]]*)'
-    
-    for match in re.finditer(pattern, content):
-        minutes = int(match.group(1))
-        seconds = int(match.group(2))
-        centiseconds = int(match.group(3))
-        text = match.group(4).strip()
+    # Scan bracket to bracket with str.find rather than a regex
+    while True:
+        open_pos = content.find('[', pos)
+        if open_pos < 0:
+            break
+        close_pos = content.find(']', open_pos + 1)
+        if close_pos < 0:
+            break
         
-        if text:
-            # Convert to milliseconds
-            if len(match.group(3)) == 2:  # Centiseconds
-                time_ms = (minutes * 60 + seconds) * 1000 + centiseconds * 10
-            else:  # Milliseconds
-                time_ms = (minutes * 60 + seconds) * 1000 + centiseconds
-            
-            # Split text into syllables if it contains spaces
-            for syllable in text.split():
-                cleaned = clean_syllable(syllable)
-                if cleaned:
-                    lyrics.append({
-                        'text': cleaned,
-                        'time': time_ms,
-                        'is_word_start': True,
-                        'is_word_end': True,
-                        'original_word': cleaned
-                    })
+        time_ms = _parse_lrc_time(content[open_pos + 1:close_pos])
+        if time_ms is None:
+            pos = open_pos + 1
+            continue
+        
+        # Text runs up to the next bracket of either kind
+        text_start = close_pos + 1
+        next_open = content.find('[', text_start)
+        next_close = content.find(']', text_start)
+        text_end = min(
+            next_open if next_open >= 0 else length,
+            next_close if next_close >= 0 else length
+        )
+        text = content[text_start:text_end].strip()
+        pos = text_end
+        
+        # Split text into syllables if it contains spaces
+        for syllable in text.split():
+            cleaned = clean_syllable(syllable)
+            if cleaned:
+                lyrics.append({
+                    'text': cleaned,
+                    'time': time_ms,
+                    'is_word_start': True,
+                    'is_word_end': True,
+                    'original_word': cleaned
+                })
     
     return lyrics
 
 
+def _parse_lrc_time(stamp: str) -> Optional[int]:
+    """
+    Time in ms of an LRC timestamp body (mm:ss.xx, m:ss:xxx, ...),
+    or None if it is not one
+    """
+    minutes, colon, rest = stamp.partition(':')
+    if not colon or not (len(minutes) <= 2 and minutes.isdecimal()):
+        return None
+    seconds = rest[:2]
+    fraction = rest[2:].lstrip('.:')
+    # At least one separator, then 1-3 digits
+    if not (len(seconds) == 2 and seconds.isdecimal()) or len(fraction) == len(rest) - 2:
+        return None
+    if not (len(fraction) <= 3 and fraction.isdecimal()):
+        return None
+    
+    # Convert to milliseconds
+    if len(fraction) == 2:  # Centiseconds
+        return (int(minutes) * 60 + int(seconds)) * 1000 + int(fraction) * 10
+    else:  # Milliseconds
+        return (int(minutes) * 60 + int(seconds)) * 1000 + int(fraction)
+
+
 def parse_srt(content: str) -> List[Dict]:
     """
     Parse SRT (SubRip) subtitle format
+    Entries are an index line, a timestamp line and text lines up to
+    an empty line or the next index, read in one pass over the lines
     """
     lyrics = []
+    lines = content.split('\n')
+    line_count = len(lines)
+    i = 0
     
-    # Pattern for SRT entries
-    pattern = r'(\d+)\s*\n(\d{2}):(\d{2}):(\d{2}),(\d{3})\s*-->\s*\d{2}:\d{2}:\d{2},\d{3}\s*\n(.+?)(?=\n\n|\n\d+\s*\n|$)'
-    
-    for match in re.finditer(pattern, content, re.DOTALL):
-        hours = int(match.group(2))
-        minutes = int(match.group(3))
-        seconds = int(match.group(4))
-        milliseconds = int(match.group(5))
-        text = match.group(6).strip()
+    while i < line_count:
+        # Entry index: digits, optionally followed by whitespace
+        index = lines[i].rstrip()
+        i += 1
+        if not index or not index[-1].isdecimal():
+            continue
         
-        time_ms = ((hours * 3600 + minutes * 60 + seconds) * 1000) + milliseconds
+        # Timestamp line, possibly after blank lines; text must follow it
+        j = i
+        while j < line_count and not lines[j].strip():
+            j += 1
+        if j + 1 >= line_count:
+            continue
+        time_ms = _parse_srt_timing(lines[j])
+        if time_ms is None:
+            continue
+        
+        # Text starts at the next non-blank line
+        j += 1
+        while j < line_count and not lines[j].strip():
+            j += 1
+        if j >= line_count:
+            break
+        text_lines = [lines[j]]
+        j += 1
+        while j < line_count:
+            line = lines[j]
+            # Ends at an empty line or a line holding only the next index
+            if not line or (j + 1 < line_count and line.rstrip().isdecimal()):
+                break
+            text_lines.append(line)
+            j += 1
+        i = j
         
         # Clean HTML tags from SRT
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _HTML_TAG_RE.sub('', '\n'.join(text_lines))
         
         # Split into syllables
-        for line in text.split('\n'):
-            for word in line.split():
-                cleaned = clean_syllable(word)
-                if cleaned:
-                    lyrics.append({
-                        'text': cleaned,
-                        'time': time_ms,
-                        'is_word_start': True,
-                        'is_word_end': True,
-                        'original_word': cleaned
-                    })
+        for word in text.split():
+            cleaned = clean_syllable(word)
+            if cleaned:
+                lyrics.append({
+                    'text': cleaned,
+                    'time': time_ms,
+                    'is_word_start': True,
+                    'is_word_end': True,
+                    'original_word': cleaned
+                })
     
     return lyrics
 
 
+def _parse_srt_timing(line: str) -> Optional[int]:
+    """
+    Start time in ms of an SRT timing line ("00:00:01,000 --> 00:00:02,000"),
+    or None if the line is not one
+    """
+    start, arrow, end = line.partition('-->')
+    if not arrow:
+        return None
+    start = start.rstrip()
+    if not (_is_srt_timestamp(start) and _is_srt_timestamp(end.strip())):
+        return None
+    
+    hours = int(start[0:2])
+    minutes = int(start[3:5])
+    seconds = int(start[6:8])
+    milliseconds = int(start[9:12])
+    return ((hours * 3600 + minutes * 60 + seconds) * 1000) + milliseconds
+
+
+def _is_srt_timestamp(text: str) -> bool:
+    """Check for an exact HH:MM:SS,mmm timestamp"""
+    return (
+        len(text) == 12
+        and text[2] == ':' and text[5] == ':' and text[8] == ','
+        and (text[0:2] + text[3:5] + text[6:8] + text[9:12]).isdecimal()
+    )
+
+
 def parse_syllable(content: str) -> List[Dict]:
     """
     Parse one-syllable-per-line format
@@ -356,12 +447,16 @@ def clean_syllable(text: str) -> str:
     """
     Clean and normalize a syllable
     """
+    # ASCII fast path: same trimming as the regexes below, without them
+    if text.isascii():
+        return text.strip(_ASCII_NON_WORD)
+    
     # Remove surrounding punctuation but keep internal
     text = text.strip()
     
     # Remove leading/trailing punctuation except for apostrophes
-    text = re.sub(r'^[^\w\']+', '', text)
-    text = re.sub(r'[^\w\']+$', '', text)
+    text = _LEAD_PUNCT_RE.sub('', text)
+    text = _TRAIL_PUNCT_RE.sub('', text)
     
     return text
 
@@ -377,7 +472,30 @@ def syllabify(word: str, language: str = 'en') -> List[str]:
     Returns:
         List of syllables
     """
-    word = word.strip()
+    return list(_syllabify_cached(word.strip(), language))
+
+
+def syllabify_many(words: List[str], language: str = 'en') -> List[List[str]]:
+    """
+    Syllabify a batch of words, working out each distinct word only once
+    
+    Returns:
+        One list of syllables per input word (repeated words share a list)
+    """
+    unique = dict.fromkeys(words)
+    for word in unique:
+        unique[word] = syllabify(word, language)
+    return [unique[word] for word in words]
+
+
+@lru_cache(maxsize=8192)
+def _syllabify_cached(word: str, language: str) -> Tuple[str, ...]:
+    """Memoized syllabify; lyrics repeat the same words many times"""
+    return tuple(_syllabify_word(word, language))
+
+
+def _syllabify_word(word: str, language: str) -> List[str]:
+    """Uncached body of syllabify for an already stripped word"""
     if not word:
         return []
         
@@ -406,10 +524,9 @@ def syllabify(word: str, language: str = 'en') -> List[str]:
     
     # Use pyphen for standard syllabification
     try:
-        if language == 'en':
-            syllables = _dic_en.inserted(word, '-').split('-')
-        elif language == 'es':
-            syllables = _dic_es.inserted(word, '-').split('-')
+        dic = _PYPHEN_DICTS.get(language)
+        if dic is not None:
+            syllables = dic.inserted(word, '-').split('-')
         else:
             # Fallback to basic algorithm
             syllables = syllabify_basic(word)
@@ -432,19 +549,19 @@ def syllabify_basic(word: str) -> List[str]:
     Uses improved vowel-consonant clustering
     """
     word = word.lower()
-    vowels = 'aeiouy'
+    vowels = _VOWELS
     
     # Single letter or short words
     if len(word) <= 2:
         return [word]
     
     syllables = []
-    current = ''
+    current = []  # characters of the syllable being built
     i = 0
     
     while i < len(word):
         char = word[i]
-        current += char
+        current.append(char)
         
         # Check if current ends with a vowel
         if char in vowels:
@@ -463,32 +580,31 @@ def syllabify_basic(word: str) -> List[str]:
                     pass
                 else:
                     # Followed by vowel, split here
-                    if len(current) > 0:
-                        syllables.append(current)
-                        current = ''
+                    syllables.append(''.join(current))
+                    current.clear()
             elif consonant_count == 1:
                 # One consonant - goes with next syllable
-                if len(current) > 0:
-                    syllables.append(current)
-                    current = ''
+                syllables.append(''.join(current))
+                current.clear()
             else:
                 # Multiple consonants - split between them
-                current += word[i + 1]
-                syllables.append(current)
-                current = ''
+                current.append(word[i + 1])
+                syllables.append(''.join(current))
+                current.clear()
                 i += 1
         
         i += 1
     
     if current:
+        ending = ''.join(current)
         if syllables:
             # Merge short endings
-            if len(current) == 1 and current not in vowels:
-                syllables[-1] += current
+            if len(ending) == 1 and ending not in vowels:
+                syllables[-1] += ending
             else:
-                syllables.append(current)
+                syllables.append(ending)
         else:
-            syllables.append(current)
+            syllables.append(ending)
     
     return syllables if syllables else [word]
 
@@ -505,15 +621,20 @@ def syllabify_text(text: str, preserve_hyphenated: bool = True) -> List[Dict]:
         List of syllable dicts with word boundary info
     """
     result = []
-    words = text.split()
-    
-    for word in words:
-        cleaned = clean_syllable(word)
-        if not cleaned:
-            continue
-        
-        # Check if already hyphenated (user pre-syllabified)
-        if preserve_hyphenated and '-' in cleaned and not cleaned.startswith('-') and not cleaned.endswith('-'):
+    words = [cleaned for cleaned in map(clean_syllable, text.split()) if cleaned]
+    
+    # Check if already hyphenated (user pre-syllabified)
+    pre_syllabified = [
+        preserve_hyphenated and '-' in word and not word.startswith('-') and not word.endswith('-')
+        for word in words
+    ]
+    # All other words are auto-syllabified as one batch
+    auto_syllables = iter(syllabify_many(
+        [word for word, is_pre in zip(words, pre_syllabified) if not is_pre]
+    ))
+    
+    for cleaned, is_pre in zip(words, pre_syllabified):
+        if is_pre:
             syllables = cleaned.split('-')
             for i, syl in enumerate(syllables):
                 if syl:
@@ -525,7 +646,7 @@ def syllabify_text(text: str, preserve_hyphenated: bool = True) -> List[Dict]:
                     })
         else:
             # Auto-syllabify
-            syllables = syllabify(cleaned)
+            syllables = next(auto_syllables)
             for i, syl in enumerate(syllables):
                 result.append({
                     'text': syl,
@@ -557,27 +678,25 @@ def expand_lyrics_to_syllables(lyrics: List[Dict], target_count: int) -> List[Di
     
     # First pass: identify expandable words (those with multiple syllables)
     expandable_indices = []
-    for i, lyric in enumerate(lyrics):
-        word = lyric.get('original_word', lyric['text'])
-        syllables = syllabify(word)
+    words = [lyric.get('original_word', lyric['text']) for lyric in lyrics]
+    for i, syllables in enumerate(syllabify_many(words)):
         if len(syllables) > 1:
             expandable_indices.append((i, syllables))
     
-    # Determine how many words to expand
-    expanded_set = set()
+    # Determine how many words to expand (index -> syllables from the first pass)
+    expanded = {}
     for idx, syllables in expandable_indices:
         if remaining_to_expand <= 0:
             break
         expansion = len(syllables) - 1  # How many extra syllables we get
         if expansion <= remaining_to_expand:
-            expanded_set.add(idx)
+            expanded[idx] = syllables
             remaining_to_expand -= expansion
     
     # Build result
     for i, lyric in enumerate(lyrics):
-        if i in expanded_set:
-            word = lyric.get('original_word', lyric['text'])
-            syllables = syllabify(word)
+        syllables = expanded.get(i)
+        if syllables is not None:
             for j, syl in enumerate(syllables):
                 new_lyric = lyric.copy()
                 new_lyric['text'] = syl
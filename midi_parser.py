@@ -3,32 +3,60 @@ MIDI Parser Module
 Extracts notes, tempo, time signature, and embedded lyrics from MIDI files
 """
 
+import re
 import mido
-from typing import Dict, List, Any
+from operator import itemgetter
+from typing import Dict, List, Any, BinaryIO, Union
 
+# Common non-lyric text patterns, matched as one alternation
+SKIP_TEXT_PATTERNS = [
+    'created by', 'copyright', 'track', 'channel',
+    'instrument', 'tempo', 'http', 'www.', '.com',
+    'midi', 'sequence'
+]
+_SKIP_TEXT_RE = re.compile('|'.join(map(re.escape, SKIP_TEXT_PATTERNS)))
 
-def parse_midi(filepath: str) -> Dict[str, Any]:
+# Message types parse_midi reads; everything else is skipped up front
+_USED_MESSAGE_TYPES = frozenset({
+    'note_on', 'note_off', 'set_tempo', 'time_signature', 'lyrics', 'text'
+})
+
+
+def parse_midi(source: Union[str, BinaryIO]) -> Dict[str, Any]:
     """
     Parse a MIDI file and extract relevant musical data
     
+    Args:
+        source: Path to a MIDI file, or a binary file-like object
+    
     Returns:
         Dictionary containing:
         - notes: List of note events with pitch, start time, duration
+        - notes_by_channel: The same note events grouped by channel
         - tempo: BPM (default 120 if not specified)
         - time_signature: Tuple of (numerator, denominator)
         - lyrics: List of lyric events extracted from MIDI
     """
-    midi = mido.MidiFile(filepath)
+    if isinstance(source, str):
+        midi = mido.MidiFile(source)
+    else:
+        midi = mido.MidiFile(file=source)
     
     notes = []
+    notes_by_channel = {}  # key: channel, value: notes in that channel
+    channel_first = {}  # key: channel, value: (earliest start, append index)
     lyrics = []
     tempo = 500000  # Default tempo (120 BPM in microseconds per beat)
     time_signature = (4, 4)
     
     ticks_per_beat = midi.ticks_per_beat
+    # ticks_to_ms inlined below: ms = ticks * tempo / (ticks_per_beat * 1000)
+    ms_denominator = ticks_per_beat * 1000
     
     # Track active notes for calculating duration
-    active_notes = {}  # key: (channel, pitch), value: (start_tick, velocity)
+    # One slot per (channel, pitch), indexed by (channel << 7) | pitch:
+    # (start_tick, velocity) while the note sounds, else None
+    active_notes = [None] * (16 * 128)
     
     for track in midi.tracks:
         current_tick = 0
@@ -36,39 +64,62 @@ def parse_midi(filepath: str) -> Dict[str, Any]:
         for msg in track:
             current_tick += msg.time
             
-            if msg.type == 'set_tempo':
-                tempo = msg.tempo
-                
-            elif msg.type == 'time_signature':
-                time_signature = (msg.numerator, msg.denominator)
-                
-            elif msg.type == 'note_on' and msg.velocity > 0:
+            msg_type = msg.type
+            # Most events (controllers, program changes, ...) are not used
+            if msg_type not in _USED_MESSAGE_TYPES:
+                continue
+            
+            # Note events first, as they are by far the most common
+            if msg_type == 'note_on' and msg.velocity > 0:
                 # Note starts
-                key = (msg.channel, msg.note)
-                active_notes[key] = (current_tick, msg.velocity)
+                active_notes[(msg.channel << 7) | msg.note] = (current_tick, msg.velocity)
                 
-            elif msg.type == 'note_off' or (msg.type == 'note_on' and msg.velocity == 0):
-                # Note ends
-                key = (msg.channel, msg.note)
-                if key in active_notes:
-                    start_tick, velocity = active_notes.pop(key)
+            elif msg_type == 'note_off' or msg_type == 'note_on':
+                # Note ends (note_off, or note_on with velocity 0)
+                channel = msg.channel
+                pitch = msg.note
+                slot = (channel << 7) | pitch
+                active = active_notes[slot]
+                if active is not None:
+                    active_notes[slot] = None
+                    start_tick, velocity = active
                     duration_ticks = current_tick - start_tick
                     
                     # Convert ticks to milliseconds
-                    start_ms = ticks_to_ms(start_tick, tempo, ticks_per_beat)
-                    duration_ms = ticks_to_ms(duration_ticks, tempo, ticks_per_beat)
+                    if ms_denominator:
+                        start_ms = (start_tick * tempo) / ms_denominator
+                        duration_ms = (duration_ticks * tempo) / ms_denominator
+                    else:
+                        start_ms = duration_ms = 0
                     
-                    notes.append({
-                        'pitch': msg.note,
+                    note = {
+                        'pitch': pitch,
                         'start': start_ms,
                         'start_ticks': start_tick,
                         'duration': duration_ms,
                         'duration_ticks': duration_ticks,
                         'velocity': velocity,
-                        'channel': msg.channel
-                    })
+                        'channel': channel
+                    }
                     
-            elif msg.type == 'lyrics':
+                    # Bucket by channel while reading, remembering where each
+                    # channel first shows up in the start-sorted note order
+                    channel_notes = notes_by_channel.get(channel)
+                    if channel_notes is None:
+                        notes_by_channel[channel] = channel_notes = []
+                        channel_first[channel] = (start_ms, len(notes))
+                    elif start_ms < channel_first[channel][0]:
+                        channel_first[channel] = (start_ms, len(notes))
+                    channel_notes.append(note)
+                    notes.append(note)
+                    
+            elif msg_type == 'set_tempo':
+                tempo = msg.tempo
+                
+            elif msg_type == 'time_signature':
+                time_signature = (msg.numerator, msg.denominator)
+                
+            elif msg_type == 'lyrics':
                 # Extract embedded lyrics
                 lyrics.append({
                     'text': msg.text,
@@ -76,7 +127,7 @@ def parse_midi(filepath: str) -> Dict[str, Any]:
                     'time_ms': ticks_to_ms(current_tick, tempo, ticks_per_beat)
                 })
                 
-            elif msg.type == 'text' and is_lyric_text(msg.text):
+            elif msg_type == 'text' and is_lyric_text(msg.text):
                 # Some MIDI files use text events for lyrics
                 lyrics.append({
                     'text': msg.text,
@@ -85,14 +136,22 @@ def parse_midi(filepath: str) -> Dict[str, Any]:
                 })
     
     # Sort notes by start time
-    notes.sort(key=lambda n: n['start'])
-    lyrics.sort(key=lambda l: l['time'])
+    by_start = itemgetter('start')
+    notes.sort(key=by_start)
+    for channel_notes in notes_by_channel.values():
+        channel_notes.sort(key=by_start)
+    notes_by_channel = {
+        channel: notes_by_channel[channel]
+        for channel in sorted(channel_first, key=channel_first.get)
+    }
+    lyrics.sort(key=itemgetter('time'))
     
     # Convert tempo to BPM
     bpm = 60000000 / tempo
     
     return {
         'notes': notes,
+        'notes_by_channel': notes_by_channel,
         'tempo': bpm,
         'time_signature': time_signature,
         'lyrics': lyrics,
@@ -113,19 +172,11 @@ def is_lyric_text(text: str) -> bool:
     Heuristic to determine if a text event is likely a lyric
     (as opposed to track name, copyright, etc.)
     """
-    # Skip common non-lyric text patterns
-    skip_patterns = [
-        'created by', 'copyright', 'track', 'channel',
-        'instrument', 'tempo', 'http', 'www.', '.com',
-        'midi', 'sequence'
-    ]
-    
     text_lower = text.lower().strip()
     
-    # Skip if it matches non-lyric patterns
-    for pattern in skip_patterns:
-        if pattern in text_lower:
-            return False
+    # Skip if it matches non-lyric patterns (one scan for all of them)
+    if _SKIP_TEXT_RE.search(text_lower):
+        return False
     
     # Skip very long texts (likely descriptions)
     if len(text) > 50:
@@ -9,8 +9,13 @@ Intelligently matches lyrics to MIDI notes with various strategies:
 """
 
 from typing import List, Dict, Any, Optional, Tuple
-from lyrics_parser import syllabify, expand_lyrics_to_syllables, syllabify_text
-import copy
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import islice
+from lyrics_parser import syllabify_many, expand_lyrics_to_syllables, syllabify_text
+
+# Placeholder lyric for notes that get no lyric
+_NO_LYRIC = {'lyric': 'a', 'phoneme': 'a'}
 
 
 class SmartMatcher:
@@ -37,7 +42,7 @@ class SmartMatcher:
         
         if not lyrics:
             # No lyrics - return notes with empty lyrics
-            return [dict(n, lyric='a', phoneme='a') for n in notes]
+            return [n | _NO_LYRIC for n in notes]
         
         # Check if lyrics have timing information
         has_timing = any('time' in l for l in lyrics)
@@ -50,33 +55,45 @@ class SmartMatcher:
     def _match_timed(self, notes: List[Dict], lyrics: List[Dict]) -> List[Dict]:
         """Match lyrics to notes using timing information"""
         result = []
-        lyrics_used = set()
         tolerance = self.config['timing_tolerance']
         
+        # Unused timed lyrics ordered by (time, index); a lyric is removed once
+        # used, so each note only looks at the lyrics around its own start
+        timed = sorted((lyric['time'], i) for i, lyric in enumerate(lyrics) if 'time' in lyric)
+        times = [t for t, _ in timed]
+        indices = [i for _, i in timed]
+        
         for note in notes:
-            note_copy = copy.deepcopy(note)
+            note_copy = note.copy()
             note_start = note['start']
             
-            # Find best matching lyric by timing
-            best_lyric = None
-            best_distance = float('inf')
-            best_idx = -1
+            # Find best matching lyric by timing: the closest one within
+            # tolerance, the earliest in the lyrics list on ties
+            best = None  # (distance, lyric index, position in times)
+            pos = bisect_left(times, note_start)
             
-            for i, lyric in enumerate(lyrics):
-                if i in lyrics_used:
-                    continue
-                    
-                if 'time' in lyric:
-                    distance = abs(lyric['time'] - note_start)
-                    if distance < best_distance and distance <= tolerance:
-                        best_distance = distance
-                        best_lyric = lyric
-                        best_idx = i
+            # Distance only grows moving away from pos, in either direction
+            for k in range(pos, len(times)):
+                distance = times[k] - note_start
+                if distance > tolerance or (best and distance > best[0]):
+                    break
+                candidate = (distance, indices[k], k)
+                if best is None or candidate < best:
+                    best = candidate
+            for k in range(pos - 1, -1, -1):
+                distance = note_start - times[k]
+                if distance > tolerance or (best and distance > best[0]):
+                    break
+                candidate = (distance, indices[k], k)
+                if best is None or candidate < best:
+                    best = candidate
             
-            if best_lyric:
+            if best:
+                best_lyric = lyrics[best[1]]
                 note_copy['lyric'] = best_lyric['text']
                 note_copy['phoneme'] = self._text_to_phoneme(best_lyric['text'])
-                lyrics_used.add(best_idx)
+                del times[best[2]]
+                del indices[best[2]]
             else:
                 note_copy['lyric'] = 'a'
                 note_copy['phoneme'] = 'a'
@@ -98,9 +115,6 @@ class SmartMatcher:
         num_notes = len(notes)
         num_lyrics = len(lyrics)
         
-        # Extract text from lyrics
-        lyric_texts = [l.get('text', '') for l in lyrics]
-        
         # Perfect match case
         if num_notes == num_lyrics:
             return self._assign_one_to_one(notes, lyrics)
@@ -114,22 +128,35 @@ class SmartMatcher:
     
     def _assign_one_to_one(self, notes: List[Dict], lyrics: List[Dict]) -> List[Dict]:
         """Simple 1:1 assignment preserving metadata"""
+        # Lyric lists are all dicts or all plain strings; check the type once
+        if lyrics and not isinstance(lyrics[0], dict):
+            return self._assign_one_to_one_plain(notes, lyrics)
+        
         result = []
         for note, lyric in zip(notes, lyrics):
-            note_copy = copy.deepcopy(note)
-            text = lyric.get('text', lyric) if isinstance(lyric, dict) else lyric
+            note_copy = note.copy()
+            text = lyric.get('text', lyric)
             note_copy['lyric'] = text
             note_copy['phoneme'] = self._text_to_phoneme(text)
             
             # Preserve word boundary info
-            if isinstance(lyric, dict):
-                note_copy['is_word_start'] = lyric.get('is_word_start', True)
-                note_copy['is_word_end'] = lyric.get('is_word_end', True)
-                note_copy['original_word'] = lyric.get('original_word', text)
+            note_copy['is_word_start'] = lyric.get('is_word_start', True)
+            note_copy['is_word_end'] = lyric.get('is_word_end', True)
+            note_copy['original_word'] = lyric.get('original_word', text)
             
             result.append(note_copy)
         return result
     
+    def _assign_one_to_one_plain(self, notes: List[Dict], lyrics: List[str]) -> List[Dict]:
+        """1:1 assignment of plain text lyrics (no word boundary info)"""
+        result = []
+        for note, text in zip(notes, lyrics):
+            note_copy = note.copy()
+            note_copy['lyric'] = text
+            note_copy['phoneme'] = self._text_to_phoneme(text)
+            result.append(note_copy)
+        return result
+    
     def _handle_more_lyrics_smart(self, notes: List[Dict], lyrics: List[Dict]) -> List[Dict]:
         """
         Handle case where there are more lyrics than notes
@@ -142,11 +169,16 @@ class SmartMatcher:
         # Calculate how many lyrics per note on average
         lyrics_per_note = num_lyrics / num_notes
         
+        # Lyric fields read in the loop below, extracted once
+        texts = [l.get('text', '') for l in lyrics]
+        word_ends = [l.get('is_word_end', True) for l in lyrics]
+        respect_word_boundaries = self.config['respect_word_boundaries']
+        
         # Try to find word boundaries to group lyrics
         lyric_idx = 0
         
         for i, note in enumerate(notes):
-            note_copy = copy.deepcopy(note)
+            note_copy = note.copy()
             
             # Calculate how many lyrics this note should get
             remaining_notes = num_notes - i
@@ -160,24 +192,16 @@ class SmartMatcher:
                 lyrics_to_take = max(1, int(remaining_lyrics / remaining_notes))
                 
                 # Adjust to word boundary if respecting boundaries
-                if self.config['respect_word_boundaries'] and lyric_idx + lyrics_to_take < num_lyrics:
+                if respect_word_boundaries and lyric_idx + lyrics_to_take < num_lyrics:
                     for j in range(lyrics_to_take, min(lyrics_to_take + 3, remaining_lyrics)):
                         if lyric_idx + j >= num_lyrics:
                             break
-                        if lyrics[lyric_idx + j - 1].get('is_word_end', True):
+                        if word_ends[lyric_idx + j - 1]:
                             lyrics_to_take = j
                             break
             
-            # Merge the lyrics
-            merged_texts = []
-            for j in range(lyrics_to_take):
-                if lyric_idx + j < num_lyrics:
-                    text = lyrics[lyric_idx + j].get('text', '')
-                    # Add hyphen if mid-word continuation
-                    if j > 0 and not lyrics[lyric_idx + j].get('is_word_start', True):
-                        merged_texts.append(text)
-                    else:
-                        merged_texts.append(text)
+            # Merge the lyrics (mid-word continuations are joined the same way)
+            merged_texts = texts[lyric_idx:lyric_idx + lyrics_to_take]
             
             merged_text = ''.join(merged_texts) if len(merged_texts) <= 2 else ' '.join(merged_texts)
             note_copy['lyric'] = merged_text
@@ -228,17 +252,21 @@ class SmartMatcher:
         
         gap_threshold = self.config['phrase_gap_threshold']
         phrases = [[0]]
+        current = phrases[0]
         
-        for i in range(1, len(notes)):
-            prev_end = notes[i-1]['start'] + notes[i-1]['duration']
-            curr_start = notes[i]['start']
+        # One pass carrying the previous note's end instead of re-indexing it
+        prev_end = notes[0]['start'] + notes[0]['duration']
+        for i, note in enumerate(islice(notes, 1, None), 1):
+            curr_start = note['start']
             gap = curr_start - prev_end
             
             if gap >= gap_threshold:
                 # New phrase
-                phrases.append([i])
+                current = [i]
+                phrases.append(current)
             else:
-                phrases[-1].append(i)
+                current.append(i)
+            prev_end = curr_start + note['duration']
         
         return phrases
     
@@ -270,11 +298,11 @@ class SmartMatcher:
         """
         Distribute lyrics among notes respecting phrase and word boundaries
         """
-        result = [copy.deepcopy(n) for n in notes]
+        result = [n.copy() for n in notes]
         num_notes = len(notes)
         num_lyrics = len(lyrics)
         
-        if num_lyrics == 0:
+        if num_lyrics == 0 or num_notes == 0:
             for note in result:
                 note['lyric'] = 'a'
                 note['phoneme'] = 'a'
@@ -284,29 +312,29 @@ class SmartMatcher:
         notes_per_lyric = num_notes / num_lyrics
         
         # Assign lyrics with even distribution
-        lyric_assign = {}  # note_idx -> lyric_idx
+        lyric_assign = [None] * num_notes  # note_idx -> lyric_idx
+        last_note = num_notes - 1
         
         for lyric_idx in range(num_lyrics):
             # Calculate which note this lyric should go to
             note_idx = int(lyric_idx * notes_per_lyric)
-            note_idx = min(note_idx, num_notes - 1)
+            note_idx = min(note_idx, last_note)
             
             # If this note already has a lyric, find next available
-            while note_idx in lyric_assign and note_idx < num_notes - 1:
+            while note_idx < last_note and lyric_assign[note_idx] is not None:
                 note_idx += 1
             
             lyric_assign[note_idx] = lyric_idx
         
         # Apply assignments
-        for note_idx, note in enumerate(result):
-            if note_idx in lyric_assign:
-                lyric_idx = lyric_assign[note_idx]
+        for note, lyric_idx in zip(result, lyric_assign):
+            if lyric_idx is not None:
                 lyric = lyrics[lyric_idx]
-                text = lyric.get('text', lyric) if isinstance(lyric, dict) else lyric
+                text = lyric.get('text', lyric)
                 note['lyric'] = text
                 note['phoneme'] = self._text_to_phoneme(text)
-                note['is_word_start'] = lyric.get('is_word_start', True) if isinstance(lyric, dict) else True
-                note['is_word_end'] = lyric.get('is_word_end', True) if isinstance(lyric, dict) else True
+                note['is_word_start'] = lyric.get('is_word_start', True)
+                note['is_word_end'] = lyric.get('is_word_end', True)
             else:
                 # No lyric assigned - continuation
                 note['lyric'] = '-'
@@ -348,20 +376,19 @@ class SmartMatcher:
         splits = {}
         if splittable and extra_needed > 0:
             remaining = extra_needed
+            # Round-robin passes; notes that can't take another part drop out
+            # of the next pass instead of being removed from a copied list
             while remaining > 0 and splittable:
-                for idx in splittable[:]:
+                still_splittable = []
+                for idx in splittable:
                     if remaining <= 0:
                         break
                     current_parts = splits.get(idx, 1)
-                    note_duration = notes[idx]['duration']
-                    if note_duration / (current_parts + 1) >= min_duration:
+                    if notes[idx]['duration'] / (current_parts + 1) >= min_duration:
                         splits[idx] = current_parts + 1
                         remaining -= 1
-                    else:
-                        splittable.remove(idx)
-                
-                if not splittable:
-                    break
+                        still_splittable.append(idx)
+                splittable = still_splittable
         
         lyric_idx = 0
         for i, note in enumerate(notes):
@@ -371,7 +398,7 @@ class SmartMatcher:
                 part_duration_ticks = note.get('duration_ticks', note['duration']) / num_parts
                 
                 for p in range(num_parts):
-                    note_copy = copy.deepcopy(note)
+                    note_copy = note.copy()
                     note_copy['start'] = note['start'] + (p * part_duration)
                     note_copy['duration'] = part_duration
                     
@@ -391,7 +418,7 @@ class SmartMatcher:
                     
                     result.append(note_copy)
             else:
-                note_copy = copy.deepcopy(note)
+                note_copy = note.copy()
                 if lyric_idx < num_lyrics:
                     note_copy['lyric'] = lyrics[lyric_idx]
                     note_copy['phoneme'] = self._text_to_phoneme(lyrics[lyric_idx])
@@ -417,8 +444,7 @@ class SmartMatcher:
         num_lyrics = len(lyrics)
         
         expanded_lyrics = []
-        for lyric in lyrics:
-            syllables = syllabify(lyric)
+        for lyric, syllables in zip(lyrics, syllabify_many(lyrics)):
             if len(syllables) > 1 and len(expanded_lyrics) + len(syllables) <= num_notes:
                 expanded_lyrics.extend(syllables)
             else:
@@ -437,7 +463,7 @@ class SmartMatcher:
         pos_to_lyric = {pos: lyric for pos, lyric in zip(lyric_positions, expanded_lyrics)}
         
         for i, note in enumerate(notes):
-            note_copy = copy.deepcopy(note)
+            note_copy = note.copy()
             if i in pos_to_lyric:
                 note_copy['lyric'] = pos_to_lyric[i]
                 note_copy['phoneme'] = self._text_to_phoneme(pos_to_lyric[i])
@@ -455,17 +481,27 @@ class SmartMatcher:
         if not text or text == '-':
             return ''
         
-        text = text.lower().strip()
-        return text
+        return _text_to_phoneme(text)
+
+
+@lru_cache(maxsize=4096)
+def _text_to_phoneme(text: str) -> str:
+    """Memoized body of SmartMatcher._text_to_phoneme; syllables repeat a lot"""
+    text = text.lower().strip()
+    return text
 
 
+@lru_cache(maxsize=32)
 def create_matcher(
     respect_word_boundaries: bool = True,
     auto_syllabify: bool = True,
     timing_tolerance: int = 200,
     phrase_gap_threshold: int = 500
 ) -> SmartMatcher:
-    """Factory function to create a configured SmartMatcher"""
+    """
+    Factory function to create a configured SmartMatcher
+    SmartMatcher only holds its config, so one instance per option set is reused
+    """
     return SmartMatcher({
         'min_note_duration': 50,
         'split_threshold': 0.3,
@@ -13,10 +13,10 @@ https://github.com/sdercolin/utaformatix3
 
 from enum import Enum
 from typing import List, Dict, Tuple, Optional, Any
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from functools import lru_cache
+from xml.sax.saxutils import escape
 import uuid
-import json
+import orjson
 import zipfile
 import io
 import yaml
@@ -37,6 +37,138 @@ TICK_RATE = 480          # Standard MIDI ticks per quarter note
 BPM_RATE = 100.0        # VPR tempo multiplier
 
 
+# VSQX documents are written from text templates laid out as a 2-space
+# indented VSQ4 file; only the per-song fields and notes are filled in
+VSQX_TEMPLATE = '''<?xml version="1.0" encoding="UTF-8"?>
+<vsq4 xmlns="http://www.yamaha.co.jp/vocaloid/schema/vsq4/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="http://www.yamaha.co.jp/vocaloid/schema/vsq4/ vsq4.xsd">
+  <vender>Yamaha corporation</vender>
+  <version>4.0.0.3</version>
+  <vVoiceTable>
+    <vVoice>
+      <bs>1</bs>
+      <pc>0</pc>
+      {singer_id}
+      {singer_name}
+      <vPrm>
+        <bre>0</bre>
+        <bri>0</bri>
+        <cle>0</cle>
+        <gen>0</gen>
+        <ope>0</ope>
+      </vPrm>
+    </vVoice>
+  </vVoiceTable>
+  <mixer>
+    <masterUnit>
+      <oDev>0</oDev>
+      <rLvl>0</rLvl>
+      <vol>0</vol>
+    </masterUnit>
+    <vsUnit>
+      <tNo>0</tNo>
+      <iGin>0</iGin>
+      <sLvl>-898</sLvl>
+      <sEnable>0</sEnable>
+      <m>0</m>
+      <s>0</s>
+      <pan>64</pan>
+      <vol>0</vol>
+    </vsUnit>
+    <monoUnit>
+      <iGin>0</iGin>
+      <sLvl>-898</sLvl>
+      <sEnable>0</sEnable>
+      <m>0</m>
+      <s>0</s>
+      <pan>64</pan>
+      <vol>0</vol>
+    </monoUnit>
+    <stUnit>
+      <iGin>0</iGin>
+      <m>0</m>
+      <s>0</s>
+      <vol>-129</vol>
+    </stUnit>
+  </mixer>
+  <masterTrack>
+    {seq_name}
+    {comment}
+    <resolution>{resolution}</resolution>
+    <preMeasure>{pre_measure}</preMeasure>
+    <timeSig>
+      <m>0</m>
+      <nu>{nu}</nu>
+      <de>{de}</de>
+    </timeSig>
+    <tempo>
+      <t>0</t>
+      <v>{tempo}</v>
+    </tempo>
+  </masterTrack>
+  <vsTrack>
+    <tNo>0</tNo>
+    {track_name}
+    {track_comment}
+    <vsPart>
+      <t>{tick_prefix}</t>
+      <playTime>{play_time}</playTime>
+      {part_name}
+      <comment />
+      <sPlug>
+        <id>ACA9C502-A04B-42b5-B2EB-5CEA36D16FCE</id>
+        <name>VOCALOID2 Compatible Style</name>
+        <version>3.0.0.1</version>
+      </sPlug>
+      <pStyle>
+        <v id="accent">50</v>
+        <v id="bendDep">8</v>
+        <v id="bendLen">0</v>
+        <v id="decay">50</v>
+        <v id="fallPort">0</v>
+        <v id="opening">127</v>
+        <v id="risePort">0</v>
+      </pStyle>
+      <singer>
+        <t>0</t>
+        <bs>1</bs>
+        <pc>0</pc>
+      </singer>{notes}
+      <plane>0</plane>
+    </vsPart>
+  </vsTrack>
+  <monoTrack />
+  <stTrack />
+  <aux>
+    <id>AUX_VST_HOST_CHUNK_INFO</id>
+    <content>VlNDSwAAAAADAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=</content>
+  </aux>
+</vsq4>
+'''
+# A note is its start tick followed by a body that depends only on the
+# note's other fields; bodies repeat a lot, so they are cached
+VSQX_NOTE_HEAD = '\n      <note>\n        <t>'
+VSQX_NOTE_BODY_TEMPLATE = (
+    '</t>\n'
+    '        <dur>{}</dur>\n'
+    '        <n>{}</n>\n'
+    '        <v>{}</v>\n'
+    '        {}\n'
+    '        {}\n'
+    '        <nStyle>\n'
+    '          <v id="accent">50</v>\n'
+    '          <v id="bendDep">8</v>\n'
+    '          <v id="bendLen">0</v>\n'
+    '          <v id="decay">50</v>\n'
+    '          <v id="fallPort">0</v>\n'
+    '          <v id="opening">127</v>\n'
+    '          <v id="risePort">0</v>\n'
+    '          <v id="vibLen">0</v>\n'
+    '          <v id="vibType">0</v>\n'
+    '        </nStyle>\n'
+    '      </note>'
+)
+
+
 # Default generic singer
 DEFAULT_SINGER = {'id': 'DEFAULT', 'name': 'Default', 'lang': 'Japanese'}
 
@@ -84,8 +216,7 @@ def generate_output(
         content = _generate_ustx(notes, tempo, time_signature, singer_name, project_name)
         return content.encode('utf-8')
     elif output_format == OutputFormat.SVP:
-        content = _generate_svp(notes, tempo, time_signature, singer_name, project_name)
-        return content.encode('utf-8')
+        return _generate_svp(notes, tempo, time_signature, singer_name, project_name)
     else:
         raise ValueError(f"Unknown format: {output_format}")
 
@@ -115,8 +246,7 @@ def generate_multi_track_output(
         content = _generate_ustx_multi(tracks, tempo, time_signature, singer_name)
         return content.encode('utf-8')
     elif output_format == OutputFormat.SVP:
-        content = _generate_svp_multi(tracks, tempo, time_signature, singer_name)
-        return content.encode('utf-8')
+        return _generate_svp_multi(tracks, tempo, time_signature, singer_name)
     else:
         raise ValueError(f"Unknown format: {output_format}")
 
@@ -157,160 +287,56 @@ def _generate_vsqx(
     """Generate VSQX (Vocaloid 4) format"""
     singer = get_singer(singer_name)
     
-    root = ET.Element('vsq4')
-    root.set('xmlns', 'http://www.yamaha.co.jp/vocaloid/schema/vsq4/')
-    root.set('xmlns:xsi', 'http://www.w3.org/2001/XMLSchema-instance')
-    root.set('xsi:schemaLocation', 'http://www.yamaha.co.jp/vocaloid/schema/vsq4/ vsq4.xsd')
-    
-    ET.SubElement(root, 'vender').text = 'Yamaha corporation'
-    ET.SubElement(root, 'version').text = '4.0.0.3'
-    
-    # Voice table
-    voice_table = ET.SubElement(root, 'vVoiceTable')
-    voice = ET.SubElement(voice_table, 'vVoice')
-    ET.SubElement(voice, 'bs').text = '1'
-    ET.SubElement(voice, 'pc').text = '0'
-    ET.SubElement(voice, 'id').text = singer['id']
-    ET.SubElement(voice, 'name').text = singer['name']
-    
-    v_prm = ET.SubElement(voice, 'vPrm')
-    for param in ['bre', 'bri', 'cle', 'gen', 'ope']:
-        ET.SubElement(v_prm, param).text = '0'
-    
-    # Mixer
-    mixer = ET.SubElement(root, 'mixer')
-    master_unit = ET.SubElement(mixer, 'masterUnit')
-    ET.SubElement(master_unit, 'oDev').text = '0'
-    ET.SubElement(master_unit, 'rLvl').text = '0'
-    ET.SubElement(master_unit, 'vol').text = '0'
-    
-    vs_unit = ET.SubElement(mixer, 'vsUnit')
-    ET.SubElement(vs_unit, 'tNo').text = '0'
-    ET.SubElement(vs_unit, 'iGin').text = '0'
-    ET.SubElement(vs_unit, 'sLvl').text = '-898'
-    ET.SubElement(vs_unit, 'sEnable').text = '0'
-    ET.SubElement(vs_unit, 'm').text = '0'
-    ET.SubElement(vs_unit, 's').text = '0'
-    ET.SubElement(vs_unit, 'pan').text = '64'
-    ET.SubElement(vs_unit, 'vol').text = '0'
-    
-    for unit_name in ['monoUnit', 'stUnit']:
-        unit = ET.SubElement(mixer, unit_name)
-        ET.SubElement(unit, 'iGin').text = '0'
-        if unit_name == 'monoUnit':
-            ET.SubElement(unit, 'sLvl').text = '-898'
-            ET.SubElement(unit, 'sEnable').text = '0'
-        ET.SubElement(unit, 'm').text = '0'
-        ET.SubElement(unit, 's').text = '0'
-        if unit_name == 'monoUnit':
-            ET.SubElement(unit, 'pan').text = '64'
-        ET.SubElement(unit, 'vol').text = '-129' if unit_name == 'stUnit' else '0'
-    
-    # Master track
-    master_track = ET.SubElement(root, 'masterTrack')
-    ET.SubElement(master_track, 'seqName').text = project_name
-    ET.SubElement(master_track, 'comment').text = comment
-    ET.SubElement(master_track, 'resolution').text = str(TICK_RATE)
-    measure_prefix = 4
-    ET.SubElement(master_track, 'preMeasure').text = str(measure_prefix)
-    
-    time_sig = ET.SubElement(master_track, 'timeSig')
-    ET.SubElement(time_sig, 'm').text = '0'
-    ET.SubElement(time_sig, 'nu').text = str(time_signature[0])
-    ET.SubElement(time_sig, 'de').text = str(time_signature[1])
-    
-    tempo_elem = ET.SubElement(master_track, 'tempo')
-    ET.SubElement(tempo_elem, 't').text = '0'
-    ET.SubElement(tempo_elem, 'v').text = str(int(tempo * BPM_RATE))
-    
     # Calculate tick prefix
-    ticks_per_measure = int(time_signature[0] * TICK_RATE * 4 / time_signature[1])
+    measure_prefix = 4
+    ticks_per_measure = time_signature[0] * TICK_RATE * 4 // time_signature[1]
     tick_prefix = measure_prefix * ticks_per_measure
     
-    # VS Track
-    vs_track = ET.SubElement(root, 'vsTrack')
-    ET.SubElement(vs_track, 'tNo').text = '0'
-    ET.SubElement(vs_track, 'name').text = project_name
-    ET.SubElement(vs_track, 'comment').text = project_name
-    
-    vs_part = ET.SubElement(vs_track, 'vsPart')
-    ET.SubElement(vs_part, 't').text = str(tick_prefix)
-    total_ticks = _get_total_ticks(notes)
-    ET.SubElement(vs_part, 'playTime').text = str(total_ticks)
-    ET.SubElement(vs_part, 'name').text = project_name
-    ET.SubElement(vs_part, 'comment').text = ''
-    
-    # Singing style plugin
-    s_plug = ET.SubElement(vs_part, 'sPlug')
-    ET.SubElement(s_plug, 'id').text = 'ACA9C502-A04B-42b5-B2EB-5CEA36D16FCE'
-    ET.SubElement(s_plug, 'name').text = 'VOCALOID2 Compatible Style'
-    ET.SubElement(s_plug, 'version').text = '3.0.0.1'
-    
-    # Part style
-    p_style = ET.SubElement(vs_part, 'pStyle')
-    _add_vsqx_style_elements(p_style)
-    
-    # Singer reference
-    singer_elem = ET.SubElement(vs_part, 'singer')
-    ET.SubElement(singer_elem, 't').text = '0'
-    ET.SubElement(singer_elem, 'bs').text = '1'
-    ET.SubElement(singer_elem, 'pc').text = '0'
-    
-    # Add notes
-    for note in notes:
-        _add_vsqx_note(vs_part, note)
-    
-    ET.SubElement(vs_part, 'plane').text = '0'
-    
-    # Required empty tracks
-    ET.SubElement(root, 'monoTrack')
-    ET.SubElement(root, 'stTrack')
-    
-    # Aux
-    aux = ET.SubElement(root, 'aux')
-    ET.SubElement(aux, 'id').text = 'AUX_VST_HOST_CHUNK_INFO'
-    ET.SubElement(aux, 'content').text = 'VlNDSwAAAAADAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA='
-    
-    return _prettify_xml(root)
+    return VSQX_TEMPLATE.format(
+        singer_id=_vsqx_text_element('id', singer['id']),
+        singer_name=_vsqx_text_element('name', singer['name']),
+        seq_name=_vsqx_text_element('seqName', project_name),
+        comment=_vsqx_text_element('comment', comment),
+        resolution=TICK_RATE,
+        pre_measure=measure_prefix,
+        nu=time_signature[0],
+        de=time_signature[1],
+        tempo=int(tempo * BPM_RATE),
+        track_name=_vsqx_text_element('name', project_name),
+        track_comment=_vsqx_text_element('comment', project_name),
+        tick_prefix=tick_prefix,
+        play_time=_get_total_ticks(notes),
+        part_name=_vsqx_text_element('name', project_name),
+        notes=''.join(map(_vsqx_note_fragment, notes))
+    )
+
+
+def _vsqx_note_fragment(note: Dict) -> str:
+    """Render a VSQX note element as indented XML text, led by its line break"""
+    pos_tick = note['start_ticks'] if 'start_ticks' in note else int(note['start'] * TICK_RATE / 500)
+    dur_tick = int(note['duration_ticks'] if 'duration_ticks' in note else note['duration'] * TICK_RATE / 500)
+    lyric = note.get('lyric', 'a')
+    body = _vsqx_note_body(dur_tick if dur_tick > 0 else 1, note['pitch'], note.get('velocity', 64), lyric, note.get('phoneme', lyric))
+    return f'{VSQX_NOTE_HEAD}{int(pos_tick)}{body}'
 
 
-def _add_vsqx_style_elements(parent: ET.Element) -> None:
-    """Add style elements for VSQX"""
-    styles = [
-        ('accent', '50'), ('bendDep', '8'), ('bendLen', '0'),
-        ('decay', '50'), ('fallPort', '0'), ('opening', '127'), ('risePort', '0'),
-    ]
-    for id_val, val in styles:
-        v_elem = ET.SubElement(parent, 'v')
-        v_elem.set('id', id_val)
-        v_elem.text = val
+@lru_cache(maxsize=4096, typed=True)
+def _vsqx_note_body(duration: int, pitch: int, velocity: int, lyric: str, phoneme: str) -> str:
+    """Render everything in a VSQX note after its start tick"""
+    return VSQX_NOTE_BODY_TEMPLATE.format(
+        duration,
+        pitch,
+        velocity,
+        _vsqx_text_element('y', lyric),
+        _vsqx_text_element('p', phoneme)
+    )
 
 
-def _add_vsqx_note(parent: ET.Element, note: Dict) -> None:
-    """Add a note element for VSQX"""
-    note_elem = ET.SubElement(parent, 'note')
-    
-    pos_tick = note.get('start_ticks', int(note['start'] * TICK_RATE / 500))
-    dur_tick = note.get('duration_ticks', int(note['duration'] * TICK_RATE / 500))
-    
-    ET.SubElement(note_elem, 't').text = str(int(pos_tick))
-    ET.SubElement(note_elem, 'dur').text = str(max(1, int(dur_tick)))
-    ET.SubElement(note_elem, 'n').text = str(note['pitch'])
-    ET.SubElement(note_elem, 'v').text = str(note.get('velocity', 64))
-    
-    lyric = note.get('lyric', 'a')
-    ET.SubElement(note_elem, 'y').text = lyric
-    ET.SubElement(note_elem, 'p').text = note.get('phoneme', lyric)
-    
-    n_style = ET.SubElement(note_elem, 'nStyle')
-    style_params = [
-        ('accent', '50'), ('bendDep', '8'), ('bendLen', '0'), ('decay', '50'),
-        ('fallPort', '0'), ('opening', '127'), ('risePort', '0'), ('vibLen', '0'), ('vibType', '0')
-    ]
-    for id_val, val in style_params:
-        v_elem = ET.SubElement(n_style, 'v')
-        v_elem.set('id', id_val)
-        v_elem.text = val
+def _vsqx_text_element(tag: str, text: Optional[str]) -> str:
+    """Serialize a text-only element (empty text gives a self-closing tag)"""
+    if not text:
+        return f'<{tag} />'
+    return f'<{tag}>{escape(text)}</{tag}>'
 
 
 def _generate_vsqx_multi(tracks: List[Dict], tempo: float, time_signature: Tuple[int, int], singer_name: str) -> str:
@@ -328,6 +354,13 @@ def _generate_vsqx_multi(tracks: List[Dict], tempo: float, time_signature: Tuple
 # Based on UtaFormatix Vpr.kt
 # ============================================
 
+# Default expression, phoneme weight and vibrato of every VPR note; the note
+# dicts point at these instead of building three fresh dicts per note
+VPR_NOTE_EXP = {"opening": 127}
+VPR_NOTE_WEIGHT = {"pre": 64, "post": 64}
+VPR_NOTE_VIBRATO = {"type": 0, "duration": 0}
+
+
 def _generate_vpr(
     notes: List[Dict],
     tempo: float,
@@ -341,27 +374,28 @@ def _generate_vpr(
     # Build notes array
     vpr_notes = []
     for note in notes:
-        pos_tick = note.get('start_ticks', int(note['start'] * TICK_RATE / 500))
-        dur_tick = note.get('duration_ticks', int(note['duration'] * TICK_RATE / 500))
+        pos_tick = note['start_ticks'] if 'start_ticks' in note else int(note['start'] * TICK_RATE / 500)
+        dur_tick = int(note['duration_ticks'] if 'duration_ticks' in note else note['duration'] * TICK_RATE / 500)
         
         vpr_notes.append({
             "lyric": note.get('lyric', 'a'),
             "phoneme": note.get('phoneme', 'a'),
             "isProtected": False,
             "pos": int(pos_tick),
-            "duration": max(1, int(dur_tick)),
+            "duration": dur_tick if dur_tick > 0 else 1,
             "number": note['pitch'],
             "velocity": note.get('velocity', 64),
-            "exp": {"opening": 127},
+            "exp": VPR_NOTE_EXP,
             "singingSkill": {
-                "duration": int(dur_tick) // 3,
-                "weight": {"pre": 64, "post": 64}
+                "duration": dur_tick // 3,
+                "weight": VPR_NOTE_WEIGHT
             },
-            "vibrato": {"type": 0, "duration": 0}
+            "vibrato": VPR_NOTE_VIBRATO
         })
     
     # Calculate total duration
     total_ticks = _get_total_ticks(notes) if notes else 1920
+    tempo_value = int(tempo * BPM_RATE)
     
     project = {
         "version": {"major": 5, "minor": 0, "revision": 0},
@@ -373,8 +407,8 @@ def _generate_vpr(
             "tempo": {
                 "isFolded": False,
                 "height": 0.0,
-                "global": {"isEnabled": False, "value": int(tempo * BPM_RATE)},
-                "events": [{"pos": 0, "value": int(tempo * BPM_RATE)}]
+                "global": {"isEnabled": False, "value": tempo_value},
+                "events": [{"pos": 0, "value": tempo_value}]
             },
             "timeSig": {
                 "isFolded": False,
@@ -426,9 +460,9 @@ def _generate_vpr_multi(tracks: List[Dict], tempo: float, time_signature: Tuple[
 def _create_vpr_zip(sequence: Dict) -> bytes:
     """Create VPR ZIP file"""
     buffer = io.BytesIO()
-    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-        json_content = json.dumps(sequence, indent=2, ensure_ascii=False)
-        zf.writestr('Project/sequence.json', json_content.encode('utf-8'))
+    # Fastest deflate level; the indented JSON still shrinks ~75x
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        zf.writestr('Project/sequence.json', orjson.dumps(sequence, option=orjson.OPT_INDENT_2))
     buffer.seek(0)
     return buffer.getvalue()
 
@@ -438,6 +472,10 @@ def _create_vpr_zip(sequence: Dict) -> bytes:
 # Based on UtaFormatix Ust.kt
 # ============================================
 
+# Per-note UST sections, each ending with its blank separator line
+UST_REST_TEMPLATE = '[#{:04d}]\r\nLength={}\r\nLyric=R\r\nNoteNum=60\r\nPreUtterance=\r\n'
+UST_NOTE_TEMPLATE = '[#{:04d}]\r\nLength={}\r\nLyric={}\r\nNoteNum={}\r\nPreUtterance=\r\nPBType=5\r\n'
+
 def _generate_ust(
     notes: List[Dict],
     tempo: float,
@@ -466,29 +504,19 @@ def _generate_ust(
     note_count = 0
     
     for note in notes:
-        pos_tick = note.get('start_ticks', int(note['start'] * TICK_RATE / 500))
-        dur_tick = note.get('duration_ticks', int(note['duration'] * TICK_RATE / 500))
-        dur_tick = max(60, int(dur_tick))
+        pos_tick = note['start_ticks'] if 'start_ticks' in note else int(note['start'] * TICK_RATE / 500)
+        dur_tick = note['duration_ticks'] if 'duration_ticks' in note else int(note['duration'] * TICK_RATE / 500)
+        dur_tick = int(dur_tick)
+        if dur_tick < 60:
+            dur_tick = 60
         
         # Insert rest if needed
         if pos_tick > tick_pos:
-            rest_length = pos_tick - tick_pos
-            lines.append(f'[#{note_count:04d}]')
-            lines.append(f'Length={rest_length}')
-            lines.append('Lyric=R')
-            lines.append('NoteNum=60')
-            lines.append('PreUtterance=')
-            lines.append('')
+            lines.append(UST_REST_TEMPLATE.format(note_count, pos_tick - tick_pos))
             note_count += 1
         
         # Add note
-        lines.append(f'[#{note_count:04d}]')
-        lines.append(f'Length={dur_tick}')
-        lines.append(f'Lyric={note.get("lyric", "a")}')
-        lines.append(f'NoteNum={note["pitch"]}')
-        lines.append('PreUtterance=')
-        lines.append('PBType=5')
-        lines.append('')
+        lines.append(UST_NOTE_TEMPLATE.format(note_count, dur_tick, note.get('lyric', 'a'), note['pitch']))
         
         tick_pos = pos_tick + dur_tick
         note_count += 1
@@ -517,9 +545,11 @@ def _generate_ustx(
     # Build notes list
     ustx_notes = []
     for note in notes:
-        pos_tick = note.get('start_ticks', int(note['start'] * TICK_RATE / 500))
-        dur_tick = note.get('duration_ticks', int(note['duration'] * TICK_RATE / 500))
-        dur_tick = max(60, int(dur_tick))
+        pos_tick = note['start_ticks'] if 'start_ticks' in note else int(note['start'] * TICK_RATE / 500)
+        dur_tick = note['duration_ticks'] if 'duration_ticks' in note else int(note['duration'] * TICK_RATE / 500)
+        dur_tick = int(dur_tick)
+        if dur_tick < 60:
+            dur_tick = 60
         
         ustx_notes.append({
             'position': int(pos_tick),
@@ -584,27 +614,39 @@ def _generate_ustx_multi(tracks: List[Dict], tempo: float, time_signature: Tuple
 # Based on UtaFormatix Svp.kt
 # ============================================
 
+# Constant parts of an SVP project; they are only read while serializing,
+# so every project and note shares the same objects
+SVP_EMPTY_PARAMETERS = {
+    name: {"mode": "cubic", "points": []}
+    for name in ("pitchDelta", "vibratoEnv", "loudness", "tension", "breathiness", "voicing", "gender")
+}
+SVP_EMPTY_ATTRIBUTES = {}
+
+
 def _generate_svp(
     notes: List[Dict],
     tempo: float,
     time_signature: Tuple[int, int],
     singer_name: str,
     project_name: str
-) -> str:
+) -> bytes:
     """Generate SVP (Synthesizer V) format - JSON"""
     singer = get_singer(singer_name)
     track_uuid = str(uuid.uuid4())
     
     # Convert notes to SVP format (blicks)
+    min_dur_blick = TICK_RATE_SVP // 16
     svp_notes = []
     for note in notes:
-        pos_tick = note.get('start_ticks', int(note['start'] * TICK_RATE / 500))
-        dur_tick = note.get('duration_ticks', int(note['duration'] * TICK_RATE / 500))
+        # Only fall back to ms -> ticks when the note has no tick timing
+        pos_tick = note['start_ticks'] if 'start_ticks' in note else int(note['start'] * TICK_RATE / 500)
+        dur_tick = note['duration_ticks'] if 'duration_ticks' in note else int(note['duration'] * TICK_RATE / 500)
         
         # Convert to blicks
         pos_blick = int(pos_tick * TICK_RATE_SVP / TICK_RATE)
         dur_blick = int(dur_tick * TICK_RATE_SVP / TICK_RATE)
-        dur_blick = max(TICK_RATE_SVP // 16, dur_blick)
+        if dur_blick < min_dur_blick:
+            dur_blick = min_dur_blick
         
         svp_notes.append({
             "onset": pos_blick,
@@ -612,7 +654,7 @@ def _generate_svp(
             "lyrics": note.get('lyric', 'la'),
             "phonemes": "",
             "pitch": note['pitch'],
-            "attributes": {}
+            "attributes": SVP_EMPTY_ATTRIBUTES
         })
     
     project = {
@@ -631,15 +673,7 @@ def _generate_svp(
             "mainGroup": {
                 "name": "main",
                 "uuid": track_uuid,
-                "parameters": {
-                    "pitchDelta": {"mode": "cubic", "points": []},
-                    "vibratoEnv": {"mode": "cubic", "points": []},
-                    "loudness": {"mode": "cubic", "points": []},
-                    "tension": {"mode": "cubic", "points": []},
-                    "breathiness": {"mode": "cubic", "points": []},
-                    "voicing": {"mode": "cubic", "points": []},
-                    "gender": {"mode": "cubic", "points": []}
-                },
+                "parameters": SVP_EMPTY_PARAMETERS,
                 "notes": svp_notes
             },
             "mainRef": {
@@ -665,10 +699,10 @@ def _generate_svp(
         }
     }
     
-    return json.dumps(project, indent=2, ensure_ascii=False)
+    return orjson.dumps(project, option=orjson.OPT_INDENT_2)
 
 
-def _generate_svp_multi(tracks: List[Dict], tempo: float, time_signature: Tuple[int, int], singer_name: str) -> str:
+def _generate_svp_multi(tracks: List[Dict], tempo: float, time_signature: Tuple[int, int], singer_name: str) -> bytes:
     """Generate multi-track SVP"""
     # Merge tracks
     all_notes = []
@@ -686,22 +720,15 @@ def _get_total_ticks(notes: List[Dict]) -> int:
     """Calculate total duration in ticks"""
     if not notes:
         return 1920
-    last_note = max(notes, key=lambda n: n.get('start_ticks', n['start']) + n.get('duration_ticks', n['duration']))
-    end_tick = last_note.get('start_ticks', 0) + last_note.get('duration_ticks', TICK_RATE)
+    try:
+        # Parsed notes carry tick timing, so the end is simply the largest tick sum
+        end_tick = max([n['start_ticks'] + n['duration_ticks'] for n in notes])
+    except KeyError:
+        last_note = max(notes, key=lambda n: n.get('start_ticks', n['start']) + n.get('duration_ticks', n['duration']))
+        end_tick = last_note.get('start_ticks', 0) + last_note.get('duration_ticks', TICK_RATE)
     return int(end_tick + TICK_RATE)
 
 
-def _prettify_xml(elem: ET.Element) -> str:
-    """Pretty-print XML with declaration"""
-    rough_string = ET.tostring(elem, encoding='unicode')
-    reparsed = minidom.parseString(rough_string)
-    xml_str = reparsed.toprettyxml(indent='  ')
-    if xml_str.startswith('<?xml'):
-        newline_pos = xml_str.find('?>')
-        xml_str = '<?xml version="1.0" encoding="UTF-8"?>' + xml_str[newline_pos + 2:]
-    return xml_str
-
-
 # Legacy compatibility aliases
 VSQXVersion = OutputFormat
 generate_vsqx = generate_output